@@ -1,9 +1,32 @@
+import html
+import string
 import gradio as gr
-from typing import Tuple, List, Dict, Any
+import pandas as pd
+from typing import Tuple, Dict, Any
 from game_info import game_info_service
 from downloader import download_manager
 from ..core.exceptions import SteamDownloaderError
 
+# Seconds between status polls from an open Downloads tab. Each poll is a
+# cached snapshot lookup that returns at once, and sends nothing back when
+# the revision is unchanged, so no queue worker is held between polls.
+STATUS_POLL_INTERVAL = 1
+
+_PREVIEW_TMPL = string.Template("""
+            <div style="padding: 1rem; border-radius: 8px; background: #f5f5f5;">
+                <h3>$name</h3>
+                <img src="$img" style="max-width: 100%; border-radius: 4px;">
+                <p>$desc</p>
+                <div style="margin-top: 1rem;">
+                    <strong>Price:</strong> $price
+                    <br>
+                    <strong>Developers:</strong> $devs
+                    <br>
+                    <strong>Release Date:</strong> $date
+                </div>
+            </div>
+            """)
+
 def create_game_info_component() -> Tuple[gr.components.Component, ...]:
     """Create the game information input and display components."""
     with gr.Row():
@@ -22,21 +45,17 @@ def create_game_info_component() -> Tuple[gr.components.Component, ...]:
         try:
             info = game_info_service.get_game_info(input_text)
             
-            # Create preview HTML
-            preview = f"""
-            <div style="padding: 1rem; border-radius: 8px; background: #f5f5f5;">
-                <h3>{info['name']}</h3>
-                <img src="{info.get('header_image', '')}" style="max-width: 100%; border-radius: 4px;">
-                <p>{info.get('short_description', 'No description available')}</p>
-                <div style="margin-top: 1rem;">
-                    <strong>Price:</strong> {'Free to Play' if info.get('is_free') else info.get('price_overview', {}).get('final_formatted', 'N/A')}
-                    <br>
-                    <strong>Developers:</strong> {', '.join(info.get('developers', ['Unknown']))}
-                    <br>
-                    <strong>Release Date:</strong> {info.get('release_date', {}).get('date', 'Unknown')}
-                </div>
-            </div>
-            """
+            # Create preview HTML; values come from the Steam API, so escape them
+            price = ('Free to Play' if info.get('is_free')
+                     else (info.get('price_overview') or {}).get('final_formatted', 'N/A'))
+            preview = _PREVIEW_TMPL.substitute(
+                name=html.escape(info['name']),
+                img=html.escape(info.get('header_image') or ''),
+                desc=html.escape(info.get('short_description') or 'No description available'),
+                price=html.escape(price),
+                devs=html.escape(', '.join(info.get('developers') or ('Unknown',))),
+                date=html.escape((info.get('release_date') or {}).get('date', 'Unknown'))
+            )
             
             return info, preview
             
@@ -98,9 +117,12 @@ def create_download_form() -> Tuple[gr.components.Component, ...]:
         return (anonymous_login, username, password, guard_code, 
                 validate, download_button, status)
 
-def create_downloads_tab() -> gr.components.Tab:
-    """Create the downloads status tab."""
-    with gr.Tab("Downloads"):
+def create_downloads_tab(app: gr.Blocks) -> gr.components.Tab:
+    """Create the downloads status tab.
+
+    app is the enclosing Blocks; its load event drives the live status stream.
+    """
+    with gr.Tab("Downloads") as tab:
         with gr.Row():
             with gr.Column():
                 active_downloads = gr.DataFrame(
@@ -128,34 +150,50 @@ def create_downloads_tab() -> gr.components.Tab:
                 
                 refresh_button = gr.Button("Refresh Status")
         
-        def update_status() -> Tuple[List[List[Any]], List[List[Any]], List[List[Any]]]:
-            status = download_manager.get_status()
-            
-            active = [
-                [d.id, d.name, f"{d.progress:.1f}%", d.status, d.speed, d.eta]
-                for d in status["active"]
-            ]
+        # Revision last rendered by this browser session
+        last_revision = gr.State(None)
+        
+        def status_tables(status: Dict) -> Tuple[Any, Any, Any]:
+            active = pd.DataFrame(
+                status["active_rows"],
+                columns=["ID", "Name", "Progress", "Status", "Speed", "ETA"]
+            )
             
-            queue = [
-                [i+1, d["name"], d["appid"]]
-                for i, d in enumerate(status["queue"])
-            ]
+            queue = pd.DataFrame(
+                status["queue_rows"],
+                columns=["Position", "Name", "AppID"]
+            )
             
-            history = [
-                [h["completed_at"], h["name"], h["status"]]
-                for h in status["history"]
-            ]
+            history = pd.DataFrame(
+                [
+                    [h["end_time"].strftime("%Y-%m-%d %H:%M:%S"), h["name"], h["status"]]
+                    for h in status["history"]
+                ],
+                columns=["Time", "Name", "Status"]
+            )
             
             return active, queue, history
         
+        def update_status(revision: Any) -> Tuple[Any, Any, Any, Any]:
+            status = download_manager.get_status()
+            
+            # Nothing changed since the last refresh; leave the tables alone
+            if status["revision"] == revision:
+                return gr.update(), gr.update(), gr.update(), revision
+            return (*status_tables(status), status["revision"])
+        
         def cancel_download(download_id: str) -> str:
-            if download_manager.cancel_download(download_id):
+            download_id = (download_id or "").strip()
+            if not download_id.isdigit():
+                return "❌ Download ID must be a numeric AppID"
+            if download_manager.cancel_download(int(download_id)):
                 return "✅ Download cancelled successfully"
             return "❌ Download not found"
         
         refresh_button.click(
             fn=update_status,
-            outputs=[active_downloads, queued_downloads, download_history]
+            inputs=last_revision,
+            outputs=[active_downloads, queued_downloads, download_history, last_revision]
         )
         
         cancel_button.click(
@@ -164,8 +202,12 @@ def create_downloads_tab() -> gr.components.Tab:
             outputs=cancel_status
         )
         
-        # Auto-refresh every 5 seconds
-        gr.update(every=5)(
+        # Poll while the page is open; unchanged revisions skip the redraw
+        app.load(
             fn=update_status,
-            outputs=[active_downloads, queued_downloads, download_history]
-        ) 
\ No newline at end of file
+            inputs=last_revision,
+            outputs=[active_downloads, queued_downloads, download_history, last_revision],
+            every=STATUS_POLL_INTERVAL
+        )
+    
+    return tab
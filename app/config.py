@@ -1,12 +1,16 @@
 from pathlib import Path
 import os
 from typing import Dict, Any, Optional
+from pydantic import PrivateAttr
 
 try:
     from pydantic_settings import BaseSettings
 except ImportError:
     from pydantic import BaseSettings  # Fallback for older versions
 
+# The platform never changes at runtime, so resolve the executable name once
+STEAMCMD_EXECUTABLE = "steamcmd.exe" if os.name == 'nt' else "steamcmd.sh"
+
 class Settings(BaseSettings):
     # Application Settings
     APP_NAME: str = "Steam Games Downloader"
@@ -17,6 +21,7 @@ class Settings(BaseSettings):
     BASE_DIR: Path = Path.cwd()
     STEAMCMD_DIR: Path = BASE_DIR / "steamcmd"
     LOG_DIR: Path = BASE_DIR / "logs"
+    CACHE_DIR: Path = BASE_DIR / "cache"
     DOWNLOAD_DIR: Path = Path(os.environ.get("STEAM_DOWNLOAD_PATH", BASE_DIR / "downloads"))
     
     # Server Settings
@@ -29,28 +34,54 @@ class Settings(BaseSettings):
     # Download Settings
     MAX_CONCURRENT_DOWNLOADS: int = 1
     MAX_HISTORY_SIZE: int = 50
+    MAX_QUEUE_SIZE: int = 100
     DOWNLOAD_TIMEOUT: int = 3600  # 1 hour
+    DOWNLOAD_CHUNK: int = 1 << 20  # bytes per read when streaming archives
+    # Expected SHA-256 of the SteamCMD installer archive; checked while it
+    # streams in when set. Valve republishes the archive, so it is not pinned
+    # by default.
+    STEAMCMD_SHA256: Optional[str] = None
     
     # Steam API
     STEAM_API_URL: str = "https://store.steampowered.com/api"
+    GAME_INFO_CACHE_TTL: int = 86400  # revalidate cached app details daily
     
     # Steam settings
     STEAM_GUARD_REQUIRED: bool = False
     STEAM_USERNAME: Optional[str] = None
     
+    # Set once create_directories() has run; the directories are fixed for
+    # the life of the process, so later calls have nothing to do
+    _directories_created: bool = PrivateAttr(default=False)
+    
     class Config:
         env_file = ".env"
         
     def create_directories(self) -> None:
         """Create necessary directories if they don't exist."""
-        for directory in [self.STEAMCMD_DIR, self.LOG_DIR, self.DOWNLOAD_DIR]:
-            directory.mkdir(parents=True, exist_ok=True)
+        if self._directories_created:
+            return
+        
+        targets = [self.STEAMCMD_DIR, self.LOG_DIR, self.CACHE_DIR, self.DOWNLOAD_DIR]
+        
+        # Most targets live directly under BASE_DIR; one scandir answers
+        # whether they exist instead of a stat walk per target
+        try:
+            with os.scandir(self.BASE_DIR) as entries:
+                existing = {entry.name for entry in entries if entry.is_dir()}
+        except OSError:
+            existing = set()
+        
+        for directory in targets:
+            if directory.parent == self.BASE_DIR and directory.name in existing:
+                continue
+            os.makedirs(directory, exist_ok=True)
+        
+        self._directories_created = True
             
     def get_steamcmd_path(self) -> Path:
         """Get the path to SteamCMD executable based on platform."""
-        if os.name == 'nt':  # Windows
-            return self.STEAMCMD_DIR / "steamcmd.exe"
-        return self.STEAMCMD_DIR / "steamcmd.sh"
+        return self.STEAMCMD_DIR / STEAMCMD_EXECUTABLE
 
 # Create global settings instance
 settings = Settings() 
\ No newline at end of file
@@ -1,20 +1,37 @@
 import logging
+import re
 import threading
 import time
-from typing import Dict, List, Optional
+import orjson
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Optional, Set, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 from config import settings
-from steam_cmd import steam_cmd
+# steam_handler's SteamCMD starts the download without waiting for it and
+# streams its progress, which _monitor_download consumes
+from steam_handler import steam_cmd
 import os
-from queue import Queue
 from models import DownloadStatus, DownloadProgress, GameInfo
 from utils import format_size, format_speed, format_time
 
 logger = logging.getLogger(__name__)
 
-@dataclass
-class DownloadStatus:
+# One pass over a SteamCMD progress line, e.g.
+#   Update state (0x61) downloading, progress: 45.32 (1234567890 / 2724372584)
+# captures the percentage plus downloaded and total bytes. Matched against
+# the raw output bytes; SteamCMD's progress lines are ASCII.
+_PROGRESS_RE = re.compile(
+    rb'progress:\s*([\d.]+)\s*\((\d+)\s*/\s*(\d+)\)',
+    re.IGNORECASE
+)
+
+# Minimum spacing, in seconds, between progress updates published while a
+# download is running; intermediate lines are folded into the next update.
+PROGRESS_COMMIT_INTERVAL = 0.25
+
+@dataclass(slots=True)
+class DownloadRecord:
     id: str
     appid: str
     name: str
@@ -28,21 +45,41 @@ class DownloadStatus:
 
 class DownloadManager:
     def __init__(self):
-        self.active_downloads: Dict[str, DownloadStatus] = {}
-        self.download_queue: List[Dict] = []
-        self.download_history: List[Dict] = []
-        self.lock = threading.Lock()
-        self.download_queue = Queue()
+        # Oldest entries fall off automatically once the limit is reached
+        self.download_history: Deque[Dict] = deque(maxlen=settings.MAX_HISTORY_SIZE)
+        # Pending downloads keyed by app_id in FIFO order: enqueue, pop-next
+        # and cancel are all O(1) single operations, so producers and the
+        # worker never contend on a lock; the event parks the worker until
+        # work arrives.
+        self.download_queue: OrderedDict[int, Tuple[GameInfo, Optional[Dict]]] = OrderedDict()
+        self._wake = threading.Event()
         self.active_downloads: Dict[int, DownloadProgress] = {}
+        self._download_names: Dict[int, str] = {}
+        # Game being started or downloaded by the worker, and games whose
+        # cancellation is final: the monitor stops publishing their progress
+        self._current_app_id: Optional[int] = None
+        self._cancelled: Set[int] = set()
         self.download_thread = None
         self.running = False
-        
-        # Start queue processor
-        self.queue_processor = threading.Thread(
-            target=self._process_queue,
-            daemon=True
-        )
-        self.queue_processor.start()
+
+        # Serialized form of each active download, updated per entry as its
+        # progress changes so get_status() never re-dumps unchanged models.
+        # FastAPI and Gradio threads read while the worker writes; the
+        # condition's lock guards mutations and it wakes wait_for_change().
+        self._status_changed = threading.Condition()
+        self._active_status: Dict[int, Dict] = {}
+        self._active_rows: Dict[int, Tuple] = {}
+
+        # get_status() snapshot, rebuilt only after a state change; the
+        # revision increases with every rebuild so pollers can skip redraws
+        self._status_cache: Dict = {}
+        self._status_dirty = True
+        self._status_revision = 0
+        # (revision, encoded) of the last snapshot serialized to JSON
+        self._status_json: Tuple[int, bytes] = (0, b"")
+        # Callbacks run on every state change, for waiters that can't block
+        # a thread on the condition (e.g. event-loop subscribers)
+        self._listeners: Set[Callable[[], None]] = set()
     
     def start(self):
         """Start the download manager."""
@@ -53,104 +90,334 @@ class DownloadManager:
             self.download_thread.start()
     
     def stop(self):
-        """Stop the download manager."""
+        """Stop the download manager.
+
+        Running downloads are cancelled first; the worker thread is busy
+        inside a download and joining it would otherwise wait for SteamCMD
+        to finish.
+        """
         self.running = False
+        self._wake.set()
+        current = self._current_app_id
+        if current is not None:
+            self.cancel_download(current)
         if self.download_thread:
             self.download_thread.join()
     
-    def add_to_queue(self, game_info: GameInfo, credentials: Optional[Dict] = None):
-        """Add a game to the download queue."""
-        self.download_queue.put((game_info, credentials))
-        logger.info(f"Added game {game_info.app_id} to download queue")
+    def add_to_queue(self, game_info: GameInfo, credentials: Optional[Dict] = None) -> bool:
+        """Add a game to the download queue.
+
+        Returns False if the queue already holds MAX_QUEUE_SIZE other games.
+        """
+        if (len(self.download_queue) >= settings.MAX_QUEUE_SIZE
+                and game_info.app_id not in self.download_queue):
+            logger.warning("Download queue full, rejected game %s", game_info.app_id)
+            return False
+
+        self.download_queue[game_info.app_id] = (game_info, credentials)
+        self._mark_dirty()
+        self._wake.set()
+        logger.info("Added game %s to download queue", game_info.app_id)
+        return True
     
     def _process_queue(self):
         """Process the download queue."""
         while self.running:
-            try:
-                if not self.download_queue.empty():
-                    game_info, credentials = self.download_queue.get()
+            # Parked until add_to_queue()/stop() signal; the timeout only
+            # bounds how long a missed stop() can keep the thread alive.
+            if not self._wake.wait(timeout=1.0):
+                continue
+            self._wake.clear()
+            while self.running and self.download_queue:
+                try:
+                    _, (game_info, credentials) = self.download_queue.popitem(last=False)
+                    self._mark_dirty()
                     self._handle_download(game_info, credentials)
-                time.sleep(1)
-            except Exception as e:
-                logger.error(f"Error processing download queue: {e}")
+                except Exception as e:
+                    logger.error("Error processing download queue: %s", e)
     
     def _handle_download(self, game_info: GameInfo, credentials: Optional[Dict]):
-        """Handle the download of a single game."""
+        """Handle the download of a single game.
+
+        The game is current from login until its outcome is recorded, so it
+        can be cancelled while starting as well as while downloading. Its
+        active entry is dropped once the outcome is in the history.
+        """
+        app_id = game_info.app_id
+        self._download_names[app_id] = game_info.name
+        self._current_app_id = app_id
+        status = DownloadStatus.FAILED
         try:
             # Login to Steam
-            if credentials:
-                steam_cmd.login(**credentials)
-            else:
-                steam_cmd.login()
-
-            # Prepare download directory
-            install_dir = settings.DOWNLOAD_DIR / str(game_info.app_id)
-            install_dir.mkdir(parents=True, exist_ok=True)
+            logged_in = steam_cmd.login(**credentials) if credentials else steam_cmd.login()
+            if not logged_in:
+                logger.error("Steam login failed for game %s", app_id)
+            elif app_id not in self._cancelled:
+                # Prepare download directory
+                install_dir = settings.DOWNLOAD_DIR / str(app_id)
+                install_dir.mkdir(parents=True, exist_ok=True)
 
-            # Start download
-            if steam_cmd.download_game(game_info.app_id, install_dir):
-                self._monitor_download(game_info.app_id)
-            else:
-                logger.error(f"Failed to start download for game {game_info.app_id}")
+                # Start download
+                if steam_cmd.download_game(app_id, install_dir):
+                    # A cancel that landed while SteamCMD was being spawned
+                    # had no process to stop yet
+                    if app_id in self._cancelled:
+                        steam_cmd.cancel_download()
+                    self._monitor_download(app_id)
+                    progress = self.active_downloads.get(app_id)
+                    if progress:
+                        status = progress.status
+                else:
+                    logger.error("Failed to start download for game %s", app_id)
 
         except Exception as e:
-            logger.error(f"Error downloading game {game_info.app_id}: {e}")
-            self.active_downloads[game_info.app_id] = DownloadProgress(
-                status=DownloadStatus.FAILED,
-                progress=0,
-                speed="0 B/s",
-                eta="Unknown",
-                current_file="",
-                total_size="Unknown"
+            logger.error("Error downloading game %s: %s", app_id, e)
+        finally:
+            with self._status_changed:
+                if app_id in self._cancelled:
+                    status = DownloadStatus.CANCELLED
+                self._add_to_history(game_info, status)
+                self._finish_download(app_id)
+    
+    def _finish_download(self, app_id: int):
+        """Drop a finished download's active entry."""
+        with self._status_changed:
+            self._current_app_id = None
+            self._cancelled.discard(app_id)
+            self.active_downloads.pop(app_id, None)
+            self._active_status.pop(app_id, None)
+            self._active_rows.pop(app_id, None)
+            self._download_names.pop(app_id, None)
+            self._mark_dirty()
+    
+    def _add_to_history(self, game_info: GameInfo, status: DownloadStatus):
+        """Record a finished download in the history."""
+        with self._status_changed:
+            self.download_history.append({
+                "app_id": game_info.app_id,
+                "name": game_info.name,
+                "status": status.value,
+                # Kept as a datetime; orjson and FastAPI encode it as ISO 8601
+                "end_time": datetime.now()
+            })
+            self._mark_dirty()
+
+    def _mark_dirty(self):
+        """Flag the status snapshot as stale and wake change waiters."""
+        with self._status_changed:
+            self._status_dirty = True
+            self._status_changed.notify_all()
+            for listener in self._listeners:
+                listener()
+
+    def add_listener(self, listener: Callable[[], None]):
+        """Call listener after every status change until it is removed.
+
+        Listeners run on the thread making the change, with the status lock
+        held, so they must only hand the notification off and return.
+        """
+        with self._status_changed:
+            self._listeners.add(listener)
+
+    def remove_listener(self, listener: Callable[[], None]):
+        """Stop calling a listener registered with add_listener()."""
+        with self._status_changed:
+            self._listeners.discard(listener)
+
+    def _publish_progress(self, app_id: int, progress: DownloadProgress):
+        """Store a download's progress and refresh only its status entry."""
+        with self._status_changed:
+            # An update racing a cancel must not replace CANCELLED
+            if app_id in self._cancelled and progress.status != DownloadStatus.CANCELLED:
+                return
+            self.active_downloads[app_id] = progress
+            self._active_status[app_id] = progress.model_dump()
+            # Display-ready table row, formatted once per state change rather
+            # than by every UI refresh
+            self._active_rows[app_id] = (
+                app_id,
+                self._download_names.get(app_id, str(app_id)),
+                f"{progress.progress:.1f}%",
+                progress.status.value,
+                progress.speed,
+                progress.eta
             )
+            self._mark_dirty()
     
     def _monitor_download(self, app_id: int):
-        """Monitor download progress for a game."""
-        while True:
-            progress, message = steam_cmd.get_download_progress()
-            
-            self.active_downloads[app_id] = DownloadProgress(
-                status=DownloadStatus.DOWNLOADING if progress < 100 else DownloadStatus.COMPLETED,
+        """Monitor download progress for a game.
+
+        Progress is pushed by SteamCMD's output stream, so the status is only
+        rebuilt when a new line arrives instead of on a fixed timer. Running
+        progress is published at most every PROGRESS_COMMIT_INTERVAL seconds,
+        with the latest line winning; a throttled line is flushed by a timer
+        at the end of the interval, so a stall in the output never hides it.
+        Final states are published immediately.
+        """
+        speed, eta, total_size = "0 B/s", "Unknown", "Unknown"
+        done = total = 0
+        last_bytes, last_time = 0, time.monotonic()
+        last_commit = float("-inf")
+        # Latest throttled (progress, done, total) and the timer that flushes it
+        pending: Optional[Tuple[float, int, int]] = None
+        flush_timer: Optional[threading.Timer] = None
+        commit_lock = threading.Lock()
+
+        def commit(status: DownloadStatus, progress: float, done: int, total: int):
+            nonlocal speed, eta, total_size, last_bytes, last_time, last_commit
+            now = last_commit = time.monotonic()
+            if total:
+                # Speed is averaged over the whole window since the last update
+                elapsed = now - last_time
+                if elapsed > 0 and done >= last_bytes:
+                    rate = (done - last_bytes) / elapsed
+                    speed = format_speed(rate)
+                    eta = format_time(int((total - done) / rate)) if rate > 0 else "Unknown"
+                last_bytes, last_time = done, now
+                total_size = format_size(total)
+
+            self._publish_progress(app_id, DownloadProgress(
+                status=status,
                 progress=progress,
-                speed=self._extract_speed(message),
-                eta=self._extract_eta(message),
-                current_file=self._extract_filename(message),
-                total_size=self._extract_size(message)
-            )
+                speed=speed,
+                eta=eta,
+                current_file="",
+                total_size=total_size
+            ))
+
+        def flush():
+            nonlocal pending, flush_timer
+            with commit_lock:
+                flush_timer = None
+                if pending is not None:
+                    commit(DownloadStatus.DOWNLOADING, *pending)
+                    pending = None
+
+        for progress, message in steam_cmd.iter_download_progress():
+            # Keep draining a cancelled download's output, but CANCELLED
+            # stays its final published state
+            if not message or app_id in self._cancelled:
+                continue
+
+            match = _PROGRESS_RE.search(message)
+            if match:
+                progress = float(match.group(1))
+                done, total = int(match.group(2)), int(match.group(3))
+            elif progress < 100:
+                # SteamCMD chatter without progress information
+                continue
 
-            if progress >= 100 or "Failed" in message:
-                break
-            time.sleep(1)
+            if message == b"Failed":
+                status = DownloadStatus.FAILED
+            elif progress >= 100:
+                status = DownloadStatus.COMPLETED
+            else:
+                status = DownloadStatus.DOWNLOADING
+
+            with commit_lock:
+                wait = last_commit + PROGRESS_COMMIT_INTERVAL - time.monotonic()
+                if status == DownloadStatus.DOWNLOADING and wait > 0:
+                    pending = (progress, done, total)
+                    if flush_timer is None:
+                        flush_timer = threading.Timer(wait, flush)
+                        flush_timer.daemon = True
+                        flush_timer.start()
+                    continue
+
+                pending = None
+                if flush_timer is not None:
+                    flush_timer.cancel()
+                    flush_timer = None
+                commit(status, progress, done, total)
+
+        # Nothing may be published for this download once its stream has ended
+        with commit_lock:
+            pending = None
+            if flush_timer is not None:
+                flush_timer.cancel()
     
     def get_status(self) -> Dict:
-        """Get current download status."""
-        return {
-            "queue_size": self.download_queue.qsize(),
-            "active_downloads": self.active_downloads
-        }
-    
-    def cancel_download(self, app_id: int):
-        """Cancel a specific download."""
-        steam_cmd.cancel_download()
-        if app_id in self.active_downloads:
-            self.active_downloads[app_id].status = DownloadStatus.CANCELLED
-    
-    # Helper methods for parsing SteamCMD output
-    def _extract_speed(self, message: str) -> str:
-        # Implementation for extracting speed from message
-        return "0 B/s"  # Placeholder
+        """Get current download status.
+
+        The snapshot is cached and only reassembled after the queue or an
+        active download has changed, so frequent status polling is a dict
+        return. Active entries are serialized as they change, so a rebuild
+        only copies the already-prepared values.
+        """
+        if self._status_dirty:
+            with self._status_changed:
+                # Clear the flag under the lock so a change racing with the
+                # rebuild marks the new snapshot stale again.
+                self._status_dirty = False
+                self._status_revision += 1
+                queued = list(self.download_queue.items())
+                self._status_cache = {
+                    "revision": self._status_revision,
+                    "queue_size": len(queued),
+                    "queue": [app_id for app_id, _ in queued],
+                    "queue_rows": [
+                        [position, game_info.name, app_id]
+                        for position, (app_id, (game_info, _)) in enumerate(queued, start=1)
+                    ],
+                    "active_downloads": dict(self._active_status),
+                    "active_rows": list(self._active_rows.values()),
+                    "history": list(self.download_history)
+                }
+        return self._status_cache
     
-    def _extract_eta(self, message: str) -> str:
-        # Implementation for extracting ETA from message
-        return "Unknown"  # Placeholder
+    def get_status_json(self, status: Optional[Dict] = None) -> bytes:
+        """Get a status snapshot encoded as JSON.
+
+        Each revision is encoded once and the bytes are shared by every caller;
+        pass a snapshot already obtained from get_status() to encode that one.
+        """
+        if status is None:
+            status = self.get_status()
+        revision, encoded = self._status_json
+        if revision != status["revision"]:
+            encoded = orjson.dumps(status, option=orjson.OPT_NON_STR_KEYS)
+            self._status_json = (status["revision"], encoded)
+        return encoded
     
-    def _extract_filename(self, message: str) -> str:
-        # Implementation for extracting filename from message
-        return ""  # Placeholder
+    def wait_for_change(self, revision: int, timeout: float) -> Dict:
+        """Block until the status moves past revision, or timeout expires.
+
+        Returns the current snapshot either way; callers compare its revision
+        to tell a change from a timeout.
+        """
+        with self._status_changed:
+            if not self._status_dirty and self._status_revision <= revision:
+                self._status_changed.wait(timeout)
+        return self.get_status()
     
-    def _extract_size(self, message: str) -> str:
-        # Implementation for extracting size from message
-        return "Unknown"  # Placeholder
+    def cancel_download(self, app_id: int) -> bool:
+        """Cancel a queued, starting or running download.
+
+        CANCELLED is final: the monitor publishes no further progress for the
+        game and its history entry records the cancellation.
+        """
+        if self.download_queue.pop(app_id, None) is not None:
+            self._mark_dirty()
+            return True
+
+        with self._status_changed:
+            if app_id != self._current_app_id or app_id in self._cancelled:
+                return False
+            self._cancelled.add(app_id)
+            progress = self.active_downloads.get(app_id)
+            self._publish_progress(app_id, progress.model_copy(
+                update={"status": DownloadStatus.CANCELLED}
+            ) if progress else DownloadProgress(
+                status=DownloadStatus.CANCELLED,
+                progress=0,
+                speed="0 B/s",
+                eta="Unknown",
+                current_file="",
+                total_size="Unknown"
+            ))
+        # Outside the lock: stopping SteamCMD can wait for it to exit
+        steam_cmd.cancel_download()
+        return True
 
 # Create global instance
 download_manager = DownloadManager() 
\ No newline at end of file
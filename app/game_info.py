@@ -1,18 +1,63 @@
-import re
-import json
 import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+import orjson
 import requests
 from config import settings
+from http_client import session
+from utils import APPID_URL_RE
 from ..core.exceptions import GameNotFoundError, NetworkError
 
 logger = logging.getLogger(__name__)
 
+# App details kept in process, least recently used evicted first
+FETCH_MEMO_SIZE = 512
+
+@lru_cache(maxsize=1024)
+def _parse_game_input(game_input: str) -> Optional[str]:
+    """Extract AppID from various input formats."""
+    # Direct AppID
+    if game_input.isdigit():
+        return game_input
+    
+    # Steam URL
+    match = APPID_URL_RE.search(game_input)
+    return match.group(1) if match else None
+
 class GameInfoService:
     def __init__(self):
         self.cache_dir = Path(settings.CACHE_DIR)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # One SQLite file instead of a JSON file per appid
+        self._db = sqlite3.connect(
+            str(self.cache_dir / "games.sqlite"),
+            check_same_thread=False
+        )
+        self._db_lock = threading.Lock()
+        # appid -> (time.monotonic() when fetched, info); entries expire after
+        # GAME_INFO_CACHE_TTL so the disk cache gets revalidated
+        self._memo: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+        with self._db_lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS games("
+                "appid INTEGER PRIMARY KEY, data BLOB NOT NULL, ts INTEGER NOT NULL, "
+                "etag TEXT, last_modified TEXT)"
+            )
+            # Databases created before validators were stored
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(games)")}
+            for column in ("etag", "last_modified"):
+                if column not in columns:
+                    self._db.execute(f"ALTER TABLE games ADD COLUMN {column} TEXT")
     
     def get_game_info(self, game_input: str) -> Dict[str, Any]:
         """
@@ -28,73 +73,154 @@ class GameInfoService:
         if not appid:
             raise GameNotFoundError(f"Could not extract AppID from: {game_input}")
         
+        # Shallow copy so callers can't alter the memoised entry
+        return dict(self._fetch(appid))
+    
+    def get_game_info_many(self, game_inputs: List[str], max_workers: int = 8) -> List[Dict[str, Any]]:
+        """
+        Get information for several games concurrently.
+        
+        Lookups run on a thread pool over the shared keep-alive session, so
+        uncached games are fetched in parallel instead of one round trip
+        after another.
+        
+        Args:
+            game_inputs: Game IDs, URLs, or names
+            max_workers: Upper bound on concurrent Steam API requests
+            
+        Returns:
+            Game information dicts in input order; the first failing input
+            raises the same errors as get_game_info()
+        """
+        if len(game_inputs) <= 1:
+            return [self.get_game_info(game_input) for game_input in game_inputs]
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(game_inputs))) as pool:
+            return list(pool.map(self.get_game_info, game_inputs))
+    
+    def _fetch(self, appid: str) -> Dict[str, Any]:
+        """Look up an AppID in process, then via _load().
+
+        In-process entries live for GAME_INFO_CACHE_TTL like the disk cache;
+        failures raise and are therefore not cached.
+        """
+        now = time.monotonic()
+        with self._memo_lock:
+            entry = self._memo.get(appid)
+            if entry and now - entry[0] < settings.GAME_INFO_CACHE_TTL:
+                self._memo.move_to_end(appid)
+                return entry[1]
+        
+        info = self._load(appid)
+        with self._memo_lock:
+            self._memo[appid] = (now, info)
+            self._memo.move_to_end(appid)
+            while len(self._memo) > FETCH_MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return info
+    
+    def _load(self, appid: str) -> Dict[str, Any]:
+        """Look up an AppID in the disk cache, then the Steam API.
+
+        Cache entries older than GAME_INFO_CACHE_TTL are revalidated with a
+        conditional GET, so an unchanged game costs a 304 and no body. If the
+        API can't be reached, a stale entry is served rather than failing.
+        """
         # Check cache first
-        cached_info = self._get_cached_info(appid)
-        if cached_info:
-            return cached_info
+        cached = self._get_cached_entry(appid)
+        if cached and time.time() - cached[1] < settings.GAME_INFO_CACHE_TTL:
+            return orjson.loads(cached[0])
+        
+        headers = {}
+        if cached:
+            _, _, etag, last_modified = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
         
         # Fetch from API
         try:
             url = f"{settings.STEAM_API_URL}/appdetails"
             params = {"appids": appid}
             
-            response = requests.get(url, params=params, timeout=10)
+            response = session.get(url, params=params, headers=headers, timeout=10)
+            if cached and response.status_code == 304:
+                self._touch_cache(appid)
+                return orjson.loads(cached[0])
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             if not data[appid]["success"]:
                 raise GameNotFoundError(f"Game with AppID {appid} not found")
             
             game_info = data[appid]["data"]
             
             # Cache the result
-            self._cache_info(appid, game_info)
+            self._cache_info(
+                appid,
+                game_info,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified")
+            )
             
             return game_info
             
         except requests.RequestException as e:
+            if cached:
+                logger.warning("Serving cached info for %s after refresh failed: %s", appid, str(e))
+                return orjson.loads(cached[0])
             raise NetworkError(f"Failed to fetch game info: {str(e)}")
     
     def parse_game_input(self, game_input: str) -> Optional[str]:
-        """Extract AppID from various input formats."""
-        # Direct AppID
-        if game_input.isdigit():
-            return game_input
-        
-        # Steam URL
-        url_patterns = [
-            r'store\.steampowered\.com/app/(\d+)',
-            r'steamcommunity\.com/app/(\d+)',
-            r'/app/(\d+)'
-        ]
-        
-        for pattern in url_patterns:
-            match = re.search(pattern, game_input)
-            if match:
-                return match.group(1)
-        
-        return None
+        """Extract AppID from various input formats.
+
+        Results are memoised, so re-checking the same input skips the regex.
+        """
+        return _parse_game_input(game_input)
     
-    def _get_cached_info(self, appid: str) -> Optional[Dict[str, Any]]:
-        """Get cached game information if available."""
-        cache_file = self.cache_dir / f"game_{appid}.json"
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.warning("Failed to read cache: %s", str(e))
-                return None
-        return None
+    def _get_cached_entry(
+        self, appid: str
+    ) -> Optional[Tuple[bytes, int, Optional[str], Optional[str]]]:
+        """Get the cached (data, ts, etag, last_modified) row if available."""
+        try:
+            with self._db_lock:
+                return self._db.execute(
+                    "SELECT data, ts, etag, last_modified FROM games WHERE appid = ?",
+                    (int(appid),)
+                ).fetchone()
+        except Exception as e:
+            logger.warning("Failed to read cache: %s", str(e))
+            return None
     
-    def _cache_info(self, appid: str, info: Dict[str, Any]) -> None:
-        """Cache game information."""
-        cache_file = self.cache_dir / f"game_{appid}.json"
+    def _cache_info(
+        self,
+        appid: str,
+        info: Dict[str, Any],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        """Cache game information along with its HTTP validators."""
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(info, f)
+            with self._db_lock, self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO games(appid, data, ts, etag, last_modified) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (int(appid), orjson.dumps(info), int(time.time()), etag, last_modified)
+                )
         except Exception as e:
             logger.warning("Failed to cache game info: %s", str(e))
+    
+    def _touch_cache(self, appid: str) -> None:
+        """Mark a revalidated cache entry as fresh."""
+        try:
+            with self._db_lock, self._db:
+                self._db.execute(
+                    "UPDATE games SET ts = ? WHERE appid = ?",
+                    (int(time.time()), int(appid))
+                )
+        except Exception as e:
+            logger.warning("Failed to refresh cache entry: %s", str(e))
 
 # Create global instance
 game_info_service = GameInfoService() 
\ No newline at end of file
@@ -1,13 +1,21 @@
 #!/usr/bin/env python3
 import requests
 import sys
+from requests.adapters import HTTPAdapter
 from typing import Tuple
 
+# Shared session so repeated probes reuse keep-alive connections instead of
+# paying a new TCP handshake per request.
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+
+PROBE_TIMEOUT = 2.0
+
 def check_health() -> Tuple[bool, str]:
     """Check if the application is running and healthy."""
     # Check Gradio interface
     try:
-        response = requests.get("http://localhost:7860/")
+        response = _session.get("http://localhost:7860/", timeout=PROBE_TIMEOUT)
         if response.status_code != 200:
             return False, f"Gradio interface returned status code {response.status_code}"
     except requests.RequestException as e:
@@ -15,7 +23,7 @@ def check_health() -> Tuple[bool, str]:
     
     # Check API
     try:
-        response = requests.get("http://localhost:7861/api/system")
+        response = _session.get("http://localhost:7861/api/system", timeout=PROBE_TIMEOUT)
         if response.status_code != 200:
             return False, f"API returned status code {response.status_code}"
         
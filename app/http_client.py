@@ -0,0 +1,129 @@
+import hashlib
+import os
+import shutil
+import tarfile
+import tempfile
+import requests
+from pathlib import Path
+from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import settings
+from utils import extract_zip
+
+# (connect, read) timeouts for archive downloads; the read timeout applies
+# between chunks, not to the whole transfer
+DOWNLOAD_TIMEOUT = (10, 60)
+
+# Zip archives up to this size are extracted from memory, larger ones (or
+# ones of unknown size) from a temporary file
+ZIP_MEMORY_LIMIT = 64 << 20
+
+# Shared session for SteamCDN and Steam store API traffic; repeated requests
+# to the same host reuse a kept-alive TLS connection instead of handshaking
+# again for every call.
+session = requests.Session()
+session.headers.update({
+    "User-Agent": f"{settings.APP_NAME}/{settings.VERSION}",
+    "Accept-Encoding": "gzip, deflate"
+})
+
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+)
+session.mount("https://", _adapter)
+session.mount("http://", _adapter)
+
+class DigestMismatchError(ValueError):
+    """A downloaded archive did not match its expected SHA-256."""
+
+class HashingReader:
+    """Read-only file wrapper that hashes the bytes as they stream through.
+
+    Lets an archive be checked while it is being extracted or saved, rather
+    than in a second pass over the data once it is on disk.
+    """
+
+    def __init__(self, raw):
+        self._raw = raw
+        self.hash = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._raw.read(size)
+        self.hash.update(data)
+        return data
+
+    def verify(self, expected: str, url: str) -> None:
+        """Hash anything the consumer left unread, then compare digests."""
+        while self.read(settings.DOWNLOAD_CHUNK):
+            pass
+        check_digest(self.hash.hexdigest(), expected, url)
+
+def check_digest(digest: str, expected: str, url: str) -> None:
+    """Raise DigestMismatchError unless digest matches expected."""
+    if digest != expected.lower():
+        raise DigestMismatchError(f"SHA-256 mismatch for {url}: expected {expected}, got {digest}")
+
+def get_session() -> requests.Session:
+    """Return the shared HTTP session."""
+    return session
+
+def download_zip(url: str, dest: Path, sha256: Optional[str] = None) -> None:
+    """Download a zip archive and extract it into dest.
+
+    zipfile needs a seekable source, so the archive can't be extracted
+    straight off the socket the way a tar stream can. If sha256 is given,
+    the archive is hashed as it downloads and checked before extraction.
+    """
+    with session.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        response.raise_for_status()
+        
+        length = int(response.headers.get("Content-Length") or 0)
+        if 0 < length <= ZIP_MEMORY_LIMIT:
+            content = response.content
+            if sha256:
+                check_digest(hashlib.sha256(content).hexdigest(), sha256, url)
+            extract_zip(content, dest)
+            return
+        
+        response.raw.decode_content = True
+        reader = HashingReader(response.raw)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            archive_path = os.path.join(tmp_dir, "archive.zip")
+            with open(archive_path, "wb") as f:
+                shutil.copyfileobj(reader, f, length=settings.DOWNLOAD_CHUNK)
+            if sha256:
+                reader.verify(sha256, url)
+            extract_zip(archive_path, dest)
+
+def download_tar(url: str, dest: Path, sha256: Optional[str] = None) -> None:
+    """Download a .tar.gz archive and extract it into dest.
+
+    The archive is extracted straight off the socket into a staging directory
+    next to dest and hashed on the way through; its entries are only moved
+    into dest once the digest (if sha256 is given) has matched.
+    """
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    with session.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        reader = HashingReader(response.raw)
+        with tempfile.TemporaryDirectory(dir=dest.parent) as staging:
+            # 'r|gz' reads sequentially; copybufsize raises tarfile's 16 KiB
+            # per-member copy chunk
+            with tarfile.open(fileobj=reader, mode='r|gz',
+                              bufsize=settings.DOWNLOAD_CHUNK,
+                              copybufsize=settings.DOWNLOAD_CHUNK) as tar:
+                tar.extractall(path=staging)
+            if sha256:
+                reader.verify(sha256, url)
+            
+            dest.mkdir(exist_ok=True)
+            for entry in os.listdir(staging):
+                target = dest / entry
+                if target.is_dir() and not target.is_symlink():
+                    shutil.rmtree(target)
+                os.replace(os.path.join(staging, entry), target)
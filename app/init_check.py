@@ -3,9 +3,13 @@ import os
 import sys
 import platform
 import logging
+import threading
 import psutil
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Set up basic logging
 logging.basicConfig(
@@ -16,6 +20,46 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+CONNECTIVITY_URLS = [
+    "https://store.steampowered.com",
+    "https://steamcdn-a.akamaihd.net"
+]
+
+# (connect, read) timeouts for the connectivity probes
+PROBE_TIMEOUT = (3, 5)
+
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=len(CONNECTIVITY_URLS),
+    pool_maxsize=len(CONNECTIVITY_URLS),
+    max_retries=Retry(total=1, backoff_factor=0.2)
+))
+
+class _CheckLogBuffer(logging.Filter):
+    """Holds back records logged by checks running on worker threads.
+
+    main() replays each check's records in check order once all checks have
+    finished, so concurrent checks don't interleave their output.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._records = {}
+
+    def run(self, check_func):
+        records = self._records[threading.get_ident()] = []
+        try:
+            return check_func(), records
+        finally:
+            del self._records[threading.get_ident()]
+
+    def filter(self, record):
+        records = self._records.get(record.thread)
+        if records is None:
+            return True
+        records.append(record)
+        return False
+
 def check_python_version():
     """Check if Python version is compatible."""
     required_version = (3, 9)
@@ -49,40 +93,49 @@ def check_system_resources():
 
 def check_internet_connection():
     """Check internet connectivity."""
-    test_urls = [
-        "https://store.steampowered.com",
-        "https://steamcdn-a.akamaihd.net"
-    ]
-    
-    for url in test_urls:
+    def probe(url):
         try:
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
+            # Any HTTP response proves the host is reachable; HEAD skips the body
+            _SESSION.head(url, timeout=PROBE_TIMEOUT, allow_redirects=False)
+            return url, None
         except Exception as e:
-            logger.error(f"Failed to connect to {url}: {str(e)}")
-            return False
+            return url, e
+    
+    # Probe all hosts at once so the check costs one round trip, not one per host
+    with ThreadPoolExecutor(max_workers=len(CONNECTIVITY_URLS)) as pool:
+        results = list(pool.map(probe, CONNECTIVITY_URLS))
+    
+    failed = False
+    for url, error in results:
+        if error is not None:
+            logger.error(f"Failed to connect to {url}: {str(error)}")
+            failed = True
+    if failed:
+        return False
     
     logger.info("Internet connectivity OK")
     return True
 
 def check_permissions():
     """Check if the application has necessary permissions."""
+    cwd = Path.cwd()
     paths_to_check = [
-        Path.cwd(),
-        Path.cwd() / "downloads",
-        Path.cwd() / "logs",
-        Path.cwd() / "steamcmd"
+        cwd,
+        cwd / "downloads",
+        cwd / "logs",
+        cwd / "steamcmd"
     ]
     
     for path in paths_to_check:
         try:
             path.mkdir(exist_ok=True)
-            test_file = path / ".permission_test"
-            test_file.touch()
-            test_file.unlink()
         except Exception as e:
             logger.error(f"Permission error for {path}: {str(e)}")
             return False
+        # A single access() check instead of creating and deleting a probe file
+        if not os.access(path, os.W_OK | os.X_OK):
+            logger.error(f"Permission error for {path}: directory is not writable")
+            return False
     
     logger.info("File system permissions OK")
     return True
@@ -98,10 +151,23 @@ def main():
         ("File permissions", check_permissions)
     ]
     
+    # The checks are independent, so run them together; startup then waits
+    # for the slowest check instead of the sum of all of them
+    log_buffer = _CheckLogBuffer()
+    logger.addFilter(log_buffer)
+    try:
+        with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+            futures = [pool.submit(log_buffer.run, check_func) for _, check_func in checks]
+            outcomes = [future.result() for future in futures]
+    finally:
+        logger.removeFilter(log_buffer)
+    
     results = []
-    for check_name, check_func in checks:
+    for (check_name, _), (passed, records) in zip(checks, outcomes):
         logger.info(f"\nRunning {check_name} check...")
-        results.append(check_func())
+        for record in records:
+            logger.handle(record)
+        results.append(passed)
     
     if all(results):
         logger.info("\nAll checks passed successfully!")
@@ -67,13 +67,13 @@ def create_interface() -> gr.Blocks:
             )
             
             game_info = GameInfo(app_id=game_id, name=f"Game {game_id}")
-            download_manager.add_to_queue(game_info, None if anonymous else {
+            queued = download_manager.add_to_queue(game_info, None if anonymous else {
                 "username": username,
                 "password": password,
                 "steam_guard_code": steam_guard
             })
             
-            return "Download started"
+            return "Download started" if queued else "Download queue is full, try again later"
 
         # Connect events
         anonymous_login.change(toggle_login, anonymous_login, login_group)
@@ -1,9 +1,61 @@
+import atexit
+import gzip
 import logging
+import os
+import queue
+import shutil
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from config import settings
 
+def _gzip_namer(name: str) -> str:
+    return name + ".gz"
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+class FastRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that tracks the log size in memory.
+
+    The stock handler formats every record twice and seeks to the end of the
+    file to decide whether to roll over. This one formats once and counts
+    the encoded bytes it has written instead; emit() makes the rollover
+    decision itself, so shouldRollover() is never consulted. Rotated files
+    are gzipped.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # A fixed encoding so the byte count matches what lands on disk
+        kwargs.setdefault("encoding", "utf-8")
+        super().__init__(*args, **kwargs)
+        self.namer = _gzip_namer
+        self.rotator = _gzip_rotator
+        try:
+            self._bytes_written = os.path.getsize(self.baseFilename)
+        except OSError:
+            self._bytes_written = 0
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        self._bytes_written = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = self.format(record) + self.terminator
+            size = len(msg.encode(self.encoding, "replace"))
+            if self.maxBytes > 0 and self._bytes_written + size >= self.maxBytes:
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(msg)
+            self.flush()
+            self._bytes_written += size
+        except Exception:
+            self.handleError(record)
+
 def setup_logging(name: str = None, log_file: Path = None) -> logging.Logger:
     """Configure and return a logger instance."""
     # Create logger
@@ -18,16 +70,24 @@ def setup_logging(name: str = None, log_file: Path = None) -> logging.Logger:
     # Create console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
 
     # Create file handler if log_file is specified
     if log_file:
-        file_handler = RotatingFileHandler(
+        file_handler = FastRotatingFileHandler(
             log_file,
             maxBytes=10*1024*1024,  # 10MB
             backupCount=5
         )
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    # Callers only enqueue records; a single listener thread does the
+    # console and file I/O so logging never blocks the download workers.
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
 
     return logger 
\ No newline at end of file
@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
+import asyncio
 import os
 import sys
 import signal
 import threading
 import uvicorn
+from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 # Local imports
 from config import settings
@@ -23,8 +26,21 @@ logger = setup_logging(
     log_file=settings.LOG_DIR / "steam_downloader.log"
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the download manager for as long as the API is serving."""
+    download_manager.start()
+    yield
+    # stop() joins the worker thread; keep that off the event loop
+    await asyncio.to_thread(download_manager.stop)
+
 # Initialize FastAPI
-app = FastAPI(title=settings.APP_NAME, version=settings.VERSION)
+app = FastAPI(
+    title=settings.APP_NAME,
+    version=settings.VERSION,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -33,6 +49,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Status pollers may reuse a response briefly and must then revalidate it
+# with If-None-Match, which is answered with an empty 304 when unchanged
+STATUS_CACHE_CONTROL = "max-age=2, must-revalidate"
+HEALTH_ETAG = 'W/"healthy"'
+# System metrics are resampled about once a second; the status ETag only
+# moves with them every this many samples, so polls between download
+# changes can still be answered with a 304
+METRICS_ETAG_SAMPLES = 10
+HEALTHY = {"status": "healthy"}
+
+# Longest an event stream stays silent; a comment line is sent after this
+# many seconds without a change so proxies keep the connection open
+EVENT_KEEPALIVE = 15.0
+
 # Signal handlers
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully."""
@@ -44,24 +74,86 @@ def signal_handler(signum, frame):
     signal.signal(signal.SIGTERM, signal_handler)
     
 # API Routes
-@app.get("/api/status")
-async def get_status() -> SystemStatus:
+def _not_modified(request: Request, etag: str) -> bool:
+    """Check whether the client already holds the representation for etag."""
+    return request.headers.get("if-none-match") == etag
+
+# Plain def: FastAPI runs it in its worker pool, so waiting on the download
+# manager's status lock never stalls the event loop
+@app.get("/api/status", response_model=SystemStatus)
+def get_status(request: Request):
     """Get system and download status."""
     metrics = get_system_metrics()
     download_status = download_manager.get_status()
-    
-    return SystemStatus(
+
+    # Both snapshots are versioned, so the pair identifies the response
+    # without building or serializing it; metrics are bucketed so their
+    # per-second churn doesn't defeat revalidation
+    metrics_bucket = metrics["revision"] // METRICS_ETAG_SAMPLES
+    etag = f'W/"{download_status["revision"]}-{metrics_bucket}"'
+    headers = {"ETag": etag, "Cache-Control": STATUS_CACHE_CONTROL}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    status = SystemStatus(
         cpu_usage=metrics["cpu_usage"],
         memory_usage=metrics["memory_usage"],
         disk_usage=metrics["disk_usage"],
-        download_queue=list(download_status["queue_size"]),
+        download_queue=download_status["queue"],
         active_downloads=download_status["active_downloads"]
     )
+    return ORJSONResponse(status.model_dump(), headers=headers)
 
 @app.get("/api/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint."""
-    return {"status": "healthy"}
+    headers = {"ETag": HEALTH_ETAG, "Cache-Control": STATUS_CACHE_CONTROL}
+    if _not_modified(request, HEALTH_ETAG):
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(HEALTHY, headers=headers)
+
+async def _status_events(request: Request):
+    """Yield the download status as server-sent events, once per change.
+
+    The manager is thread-based; each subscriber registers a listener that
+    sets an asyncio.Event on the loop, so waiting costs no worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    changed = asyncio.Event()
+
+    def notify():
+        try:
+            loop.call_soon_threadsafe(changed.set)
+        except RuntimeError:
+            # The loop has closed; the stream is going away with it
+            pass
+
+    download_manager.add_listener(notify)
+    try:
+        revision = -1
+        while not await request.is_disconnected():
+            # Cleared before reading so a change after the read still wakes us
+            changed.clear()
+            status = download_manager.get_status()
+            if status["revision"] != revision:
+                revision = status["revision"]
+                yield b"data: " + download_manager.get_status_json(status) + b"\n\n"
+                continue
+            try:
+                await asyncio.wait_for(changed.wait(), EVENT_KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+    finally:
+        download_manager.remove_listener(notify)
+
+@app.get("/api/events")
+async def status_events(request: Request):
+    """Push download status changes instead of having clients poll."""
+    return StreamingResponse(
+        _status_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
 
 def run_fastapi():
     """Run the FastAPI server."""
@@ -69,6 +161,10 @@ def run_fastapi():
         app,
         host=settings.HOST,
         port=int(settings.PORT) + 1,  # Use a different port for the API
+        # "auto" picks uvloop and httptools when they are installed and falls
+        # back to asyncio/h11 otherwise (uvloop has no Windows build)
+        loop="auto",
+        http="auto",
         log_level="info"
     )
 
@@ -84,10 +180,7 @@ def main():
             if not steam_cmd.install():
                 raise Exception("Failed to install SteamCMD")
         
-        # Start download manager
-        download_manager.start()
-        
-        # Start FastAPI in a separate thread
+        # Start FastAPI (and with it the download manager) in a separate thread
         api_thread = threading.Thread(target=run_fastapi, daemon=True)
         api_thread.start()
         
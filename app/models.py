@@ -18,6 +18,7 @@ class GameInfo(BaseModel):
     install_dir: Optional[str] = None
 
 class DownloadProgress(BaseModel):
+    status: DownloadStatus = DownloadStatus.PENDING
     progress: float
     speed: str
     eta: str
@@ -1,20 +1,27 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import Dict, Any
+from fastapi.concurrency import run_in_threadpool
+from typing import Dict, Any, List
+import os
 import psutil
 from datetime import datetime
 from ..services.downloader import download_manager
 from ..services.game_info import game_info_service
 from ..core.exceptions import SteamDownloaderError
 from . import schemas
+from .utils import get_system_metrics
 
 router = APIRouter()
 
+BOOT_TIME = datetime.fromtimestamp(psutil.boot_time())
+ROOT_MOUNT = os.path.abspath(os.sep)
+
 @router.post("/downloads", response_model=Dict[str, str])
 async def start_download(request: schemas.DownloadRequest) -> Dict[str, str]:
     """Start a new download."""
     try:
-        # Get game info first
-        game_info = game_info_service.get_game_info(request.game_input)
+        # Get game info first; a cache miss is a blocking Steam API call, so
+        # it runs in the worker pool instead of on the event loop
+        game_info = await run_in_threadpool(game_info_service.get_game_info, request.game_input)
         
         # Start download
         download_id = download_manager.start_download(
@@ -48,12 +55,26 @@ async def cancel_download(download_id: str) -> Dict[str, str]:
         return {"message": f"Download {download_id} cancelled successfully"}
     raise HTTPException(status_code=404, detail="Download not found")
 
+@router.get("/games", response_model=List[schemas.GameInfo])
+async def get_games_info(ids: str) -> List[schemas.GameInfo]:
+    """Get information about several games, given as comma-separated IDs or URLs."""
+    game_inputs = [game_input.strip() for game_input in ids.split(",") if game_input.strip()]
+    try:
+        # Uncached games are fetched concurrently rather than one by one
+        games = await run_in_threadpool(game_info_service.get_game_info_many, game_inputs)
+        return [schemas.GameInfo.model_construct(**game_info) for game_info in games]
+    except SteamDownloaderError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/games/{game_input}", response_model=schemas.GameInfo)
 async def get_game_info(game_input: str) -> schemas.GameInfo:
     """Get information about a game."""
     try:
-        game_info = game_info_service.get_game_info(game_input)
-        return schemas.GameInfo(**game_info)
+        game_info = await run_in_threadpool(game_info_service.get_game_info, game_input)
+        # game_info_service output is already normalised; skip re-validation
+        return schemas.GameInfo.model_construct(**game_info)
     except SteamDownloaderError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -64,12 +85,13 @@ async def get_system_status() -> schemas.SystemStatus:
     """Get system status information."""
     try:
         status = download_manager.get_status()
-        return schemas.SystemStatus(
-            cpu_usage=psutil.cpu_percent(),
-            memory_usage=psutil.virtual_memory().percent,
-            disk_usage=psutil.disk_usage('/').percent,
+        metrics = get_system_metrics()
+        return schemas.SystemStatus.model_construct(
+            cpu_usage=metrics["cpu_usage"],
+            memory_usage=metrics["memory_usage"],
+            disk_usage=metrics["disk_usage"].get(ROOT_MOUNT, 0.0),
             download_speed="N/A",  # TODO: Implement network speed monitoring
-            uptime=str(datetime.now() - datetime.fromtimestamp(psutil.boot_time())),
+            uptime=str(datetime.now() - BOOT_TIME),
             active_downloads=len(status["active"]),
             queued_downloads=len(status["queue"])
         )
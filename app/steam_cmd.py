@@ -1,34 +1,72 @@
 import os
 import platform
+import re
 import subprocess
-import requests
-import tarfile
-import zipfile
 import logging
+from collections import deque
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Callable, Tuple, Optional
 from config import settings
+from http_client import download_tar, download_zip
 from ..core.exceptions import SteamCMDError
 
 logger = logging.getLogger(__name__)
 
+_IS_WINDOWS = platform.system() == "Windows"
+
+# Matched against raw output bytes; SteamCMD's progress lines are ASCII
+_PROGRESS_RE = re.compile(rb'progress:\s*([\d.]+)', re.IGNORECASE)
+
+# SteamCMD output lines kept for error reporting after the process exits
+OUTPUT_TAIL_LINES = 200
+
+# Records the binary's mtime once a "+quit" verification run has passed
+VERIFIED_STAMP = ".verified"
+
 class SteamCMD:
     def __init__(self):
         self.path = settings.get_steamcmd_path()
+        # The path never changes after construction; stringify it once
+        self._path_str = str(self.path)
+        # Command prefix shared by every anonymous run
+        self._anon_cmd_prefix = (self._path_str, "+login", "anonymous")
+        self._stamp_path = settings.STEAMCMD_DIR / VERIFIED_STAMP
         self._ensure_installed()
     
     def _ensure_installed(self) -> None:
-        """Ensure SteamCMD is installed and up to date."""
-        if not self.path.exists():
-            logger.info("SteamCMD not found. Installing...")
-            self.install()
+        """Ensure SteamCMD is installed and up to date.
+
+        A binary that already passed verification is used as is; one that
+        hasn't (or has changed since) is verified again and reinstalled if
+        that fails.
+        """
+        if self._is_verified():
+            logger.info("SteamCMD found at: %s (verified)", self.path)
+            return
+        
+        if self.path.exists():
+            try:
+                self._verify_installation()
+                logger.info("SteamCMD found at: %s", self.path)
+                return
+            except (SteamCMDError, OSError) as e:
+                logger.warning("Existing SteamCMD failed verification, reinstalling: %s", e)
         else:
-            logger.info("SteamCMD found at: %s", self.path)
+            logger.info("SteamCMD not found. Installing...")
+        self.install()
     
     def install(self) -> None:
-        """Install SteamCMD based on platform."""
+        """Install SteamCMD based on platform.
+        
+        Skipped when the installed binary is unchanged since it last passed
+        verification, sparing a download and a SteamCMD cold start.
+        """
+        if self._is_verified():
+            logger.info("SteamCMD already installed and verified")
+            return
+        
         try:
-            if platform.system() == "Windows":
+            if _IS_WINDOWS:
                 self._install_windows()
             else:
                 self._install_unix()
@@ -42,58 +80,46 @@ class SteamCMD:
     def _install_windows(self) -> None:
         """Install SteamCMD on Windows."""
         url = "https://steamcdn-a.akamaihd.net/client/installer/steamcmd.zip"
-        zip_path = settings.STEAMCMD_DIR / "steamcmd.zip"
-        
-        # Download SteamCMD
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        
-        # Save and extract
-        with open(zip_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(settings.STEAMCMD_DIR)
-        
-        # Cleanup
-        zip_path.unlink()
+        download_zip(url, settings.STEAMCMD_DIR, settings.STEAMCMD_SHA256)
     
     def _install_unix(self) -> None:
         """Install SteamCMD on Unix-like systems."""
         url = "https://steamcdn-a.akamaihd.net/client/installer/steamcmd_linux.tar.gz"
-        tar_path = settings.STEAMCMD_DIR / "steamcmd_linux.tar.gz"
-        
-        # Download SteamCMD
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        
-        # Save and extract
-        with open(tar_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        
-        with tarfile.open(tar_path, 'r:gz') as tar:
-            tar.extractall(path=settings.STEAMCMD_DIR)
+        download_tar(url, settings.STEAMCMD_DIR, settings.STEAMCMD_SHA256)
         
         # Make executable
         self.path.chmod(0o755)
-        
-        # Cleanup
-        tar_path.unlink()
     
     def _verify_installation(self) -> None:
         """Verify SteamCMD installation by running a simple command."""
         try:
-            result = subprocess.run(
-                [str(self.path), "+quit"],
-                capture_output=True,
+            # No preexec_fn/cwd/session options here or in download_game, so
+            # CPython can spawn SteamCMD via vfork/posix_spawn instead of
+            # copying this process's page tables with fork(). The first run
+            # self-updates and is chatty; only stderr is needed on failure.
+            subprocess.run(
+                [self._path_str, "+quit"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 text=True,
                 check=True
             )
             logger.info("SteamCMD installation verified successfully")
         except subprocess.CalledProcessError as e:
             raise SteamCMDError(f"SteamCMD verification failed: {e.stderr}")
+        
+        try:
+            self._stamp_path.write_text(str(self.path.stat().st_mtime_ns))
+        except OSError as e:
+            logger.warning("Could not record SteamCMD verification: %s", e)
+    
+    def _is_verified(self) -> bool:
+        """Check whether the current binary already passed verification."""
+        try:
+            stamp = self._stamp_path.read_text().strip()
+            return stamp == str(self.path.stat().st_mtime_ns)
+        except OSError:
+            return False
     
     def download_game(
         self,
@@ -101,7 +127,8 @@ class SteamCMD:
         username: Optional[str] = None,
         password: Optional[str] = None,
         guard_code: Optional[str] = None,
-        validate: bool = True
+        validate: bool = True,
+        progress_callback: Optional[Callable[[float], None]] = None
     ) -> Tuple[bool, str]:
         """
         Download a game using SteamCMD.
@@ -112,6 +139,8 @@ class SteamCMD:
             password: Steam password (optional for free games)
             guard_code: Steam Guard code (if required)
             validate: Whether to validate game files after download
+            progress_callback: Called with the percentage from each
+                progress line SteamCMD prints
             
         Returns:
             Tuple of (success: bool, message: str)
@@ -122,38 +151,48 @@ class SteamCMD:
             download_dir.mkdir(parents=True, exist_ok=True)
             
             # Build command
-            cmd = [str(self.path)]
-            
             if username and password:
-                cmd.extend(["+login", username, password])
-                if guard_code:
-                    cmd.append(guard_code)
+                login = (self._path_str, "+login", username, password,
+                         *((guard_code,) if guard_code else ()))
             else:
-                cmd.extend(["+login", "anonymous"])
+                login = self._anon_cmd_prefix
             
-            cmd.extend([
+            cmd = [
+                *login,
                 "+force_install_dir", str(download_dir),
-                "+app_update", appid
-            ])
+                "+app_update", appid,
+                *(("validate",) if validate else ()),
+                "+quit"
+            ]
             
-            if validate:
-                cmd.append("validate")
-            
-            cmd.append("+quit")
-            
-            # Execute command
+            # Execute command, reading output as it is produced rather than
+            # buffering all of it; only a bounded tail is kept for errors.
+            # Lines stay bytes: they are scanned as-is and only the tail is
+            # decoded, once, if the download fails.
             logger.info("Starting download for AppID: %s", appid)
-            result = subprocess.run(
+            process = subprocess.Popen(
                 cmd,
-                capture_output=True,
-                text=True
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT
             )
             
+            tail = deque(maxlen=OUTPUT_TAIL_LINES)
+            succeeded = False
+            for line in process.stdout:
+                tail.append(line)
+                if b"Success! App '" in line:
+                    succeeded = True
+                elif progress_callback:
+                    match = _PROGRESS_RE.search(line)
+                    if match:
+                        progress_callback(float(match.group(1)))
+            process.wait()
+            
             # Check for success
-            if result.returncode == 0 and "Success! App '" in result.stdout:
+            if process.returncode == 0 and succeeded:
                 return True, "Download completed successfully"
             else:
-                error_msg = self._parse_error(result.stdout)
+                error_msg = self._parse_error(b"".join(tail).decode("utf-8", "replace"))
                 return False, f"Download failed: {error_msg}"
                 
         except Exception as e:
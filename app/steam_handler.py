@@ -1,24 +1,32 @@
 import os
 import subprocess
 import logging
-import requests
 from pathlib import Path
-from typing import Optional, Tuple, Dict
-from config import settings
+from typing import Optional, Tuple, Dict, Iterator, Set
+from config import settings, STEAMCMD_EXECUTABLE
+from http_client import download_tar, download_zip
 from models import GameInfo
 
 logger = logging.getLogger(__name__)
 
+_IS_WINDOWS = os.name == "nt"
+
 class SteamCMD:
     def __init__(self):
-        self.path = settings.STEAMCMD_DIR / ("steamcmd.exe" if os.name == "nt" else "steamcmd.sh")
+        self.path = settings.STEAMCMD_DIR / STEAMCMD_EXECUTABLE
+        # The path never changes after construction; stringify it once
+        self._path_str = str(self.path)
+        # Command prefix shared by every anonymous run
+        self._anon_cmd_prefix = (self._path_str, "+login", "anonymous")
         self._process = None
         self._logged_in = False
+        # Accounts SteamCMD already holds a session for (cached in config.vdf)
+        self._authed_users: Set[str] = set()
 
     def install(self) -> bool:
         """Install SteamCMD."""
         try:
-            if os.name == "nt":
+            if _IS_WINDOWS:
                 return self._install_windows()
             return self._install_unix()
         except Exception as e:
@@ -34,26 +42,12 @@ class SteamCMD:
         return self._download_and_extract(url)
 
     def _download_and_extract(self, url: str) -> bool:
-        import tarfile
-        import zipfile
-        
         try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            
-            archive_path = settings.STEAMCMD_DIR / "steamcmd_temp"
-            with open(archive_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
             if url.endswith('.zip'):
-                with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-                    zip_ref.extractall(settings.STEAMCMD_DIR)
+                download_zip(url, settings.STEAMCMD_DIR, settings.STEAMCMD_SHA256)
             else:
-                with tarfile.open(archive_path, 'r:gz') as tar_ref:
-                    tar_ref.extractall(settings.STEAMCMD_DIR)
+                download_tar(url, settings.STEAMCMD_DIR, settings.STEAMCMD_SHA256)
 
-            os.remove(archive_path)
             self.path.chmod(0o755)
             return True
 
@@ -64,20 +58,22 @@ class SteamCMD:
     def login(self, username: Optional[str] = None, password: Optional[str] = None, 
               steam_guard_code: Optional[str] = None) -> bool:
         """Login to Steam."""
+        account = username if username and password else "anonymous"
+        if account in self._authed_users:
+            self._logged_in = True
+            return True
+
         try:
-            cmd = [str(self.path)]
-            
             if username and password:
-                cmd.extend(["+login", username, password])
-                if steam_guard_code:
-                    cmd.append(steam_guard_code)
+                cmd = [self._path_str, "+login", username, password,
+                       *((steam_guard_code,) if steam_guard_code else ()), "+quit"]
             else:
-                cmd.append("+login anonymous")
-
-            cmd.append("+quit")
+                cmd = [*self._anon_cmd_prefix, "+quit"]
             
             result = subprocess.run(cmd, capture_output=True, text=True)
             self._logged_in = "Login Failure" not in result.stdout
+            if self._logged_in:
+                self._authed_users.add(account)
             return self._logged_in
 
         except Exception as e:
@@ -88,18 +84,20 @@ class SteamCMD:
         """Download a Steam game."""
         try:
             cmd = [
-                str(self.path),
+                self._path_str,
                 "+force_install_dir", str(install_dir),
                 "+app_update", str(app_id),
                 "validate",
                 "+quit"
             ]
 
+            # stderr is merged into stdout so a single reader drains both and
+            # SteamCMD can never stall on a full, unread stderr pipe. Output
+            # stays bytes; progress matching doesn't need decoded text.
             self._process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+                stderr=subprocess.STDOUT
             )
 
             return True
@@ -108,21 +106,29 @@ class SteamCMD:
             logger.error(f"Failed to start game download: {e}")
             return False
 
-    def get_download_progress(self) -> Tuple[float, str]:
-        """Get current download progress."""
-        if not self._process:
-            return 0.0, ""
+    def iter_download_progress(self) -> Iterator[Tuple[float, bytes]]:
+        """Yield download progress as SteamCMD emits it.
+
+        Blocks on the process output stream, so the caller only wakes up when
+        a new line arrives. Lines are passed on as raw bytes. The final item
+        reports completion or failure.
+        """
+        process = self._process
+        if not process:
+            return
 
-        if self._process.poll() is not None:
-            return 100.0, "Complete" if self._process.returncode == 0 else "Failed"
+        if process.stdout:
+            for line in process.stdout:
+                yield self._parse_progress(line)
 
-        return self._parse_progress(self._process.stdout.readline() if self._process.stdout else "")
+        process.wait()
+        yield 100.0, b"Complete" if process.returncode == 0 else b"Failed"
 
-    def _parse_progress(self, line: str) -> Tuple[float, str]:
+    def _parse_progress(self, line: bytes) -> Tuple[float, bytes]:
         """Parse progress from SteamCMD output."""
-        if "Progress:" in line:
+        if b"Progress:" in line:
             try:
-                progress = float(line.split("Progress:")[1].strip().rstrip("%"))
+                progress = float(line.split(b"Progress:")[1].strip().rstrip(b"%"))
                 return progress, line.strip()
             except:
                 pass
@@ -1,41 +1,166 @@
+import io
+import logging
+import os
+import re
+import threading
+import time
+import zipfile
 import psutil
-import humanize
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# AppID in a Steam store or community URL, in one pass over the input
+APPID_URL_RE = re.compile(
+    r'(?:store\.steampowered\.com/app/|steamcommunity\.com/app/|/app/)(\d+)'
+)
+
+class MetricsSampler:
+    """Samples system resource usage on a background thread.
+
+    cpu_percent(interval=...) blocks for the whole sampling window, so it runs
+    here instead of in request handlers; readers only load the latest snapshot.
+    Free disk space moves slowly, so mounts are re-read every disk_interval;
+    the mount list itself is read once when the sampler starts. Each snapshot
+    carries a revision that increases with every sample.
+    """
+
+    def __init__(self, interval: float = 1.0, disk_interval: float = 5.0):
+        self.interval = interval
+        self.disk_interval = disk_interval
+        self._snapshot: Dict = {"revision": 0, "cpu_usage": 0.0, "memory_usage": 0.0, "disk_usage": {}}
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def snapshot(self) -> Dict:
+        if self._thread is None:
+            self._start()
+        return self._snapshot
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    @staticmethod
+    def _sample_disks(mountpoints: List[str]) -> Dict[str, float]:
+        usage = {}
+        for mountpoint in mountpoints:
+            try:
+                usage[mountpoint] = psutil.disk_usage(mountpoint).percent
+            except OSError:
+                # Unmounted or unreadable since startup; skip it this round
+                continue
+        return usage
+
+    def _run(self):
+        mountpoints: List[str] = []
+        try:
+            mountpoints = [str(disk.mountpoint) for disk in psutil.disk_partitions(all=False)]
+        except Exception as e:
+            logger.error(f"Failed to list disk partitions: {e}")
+
+        disk_usage: Dict[str, float] = {}
+        next_disk_sample = 0.0
+        revision = 0
+        while True:
+            try:
+                now = time.monotonic()
+                if now >= next_disk_sample:
+                    disk_usage = self._sample_disks(mountpoints)
+                    next_disk_sample = now + self.disk_interval
+
+                # Replace the whole dict so readers never see a partial update
+                revision += 1
+                self._snapshot = {
+                    "revision": revision,
+                    "cpu_usage": psutil.cpu_percent(interval=self.interval),
+                    "memory_usage": psutil.virtual_memory().percent,
+                    "disk_usage": disk_usage
+                }
+            except Exception as e:
+                logger.error(f"Failed to sample system metrics: {e}")
+                time.sleep(self.interval)
+
+metrics_sampler = MetricsSampler()
 
 def get_system_metrics() -> Dict:
-    """Get system resource usage metrics."""
-    return {
-        "cpu_usage": psutil.cpu_percent(),
-        "memory_usage": psutil.virtual_memory().percent,
-        "disk_usage": {
-            str(disk.mountpoint): disk.percent 
-            for disk in psutil.disk_partitions(all=False)
-        }
-    }
+    """Get the latest system resource usage metrics."""
+    return metrics_sampler.snapshot
+
+def extract_zip(archive: Union[bytes, str, Path], dest: Path, parallel_threshold: int = 8) -> None:
+    """Extract a zip archive, given as bytes or a file path, into dest.
+
+    Entries inflate independently and zlib releases the GIL, so archives with
+    at least parallel_threshold entries are spread over a thread pool. Each
+    worker opens its own ZipFile, since a ZipFile handle is not thread-safe.
+    """
+    def open_archive() -> zipfile.ZipFile:
+        return zipfile.ZipFile(io.BytesIO(archive) if isinstance(archive, bytes) else archive)
+
+    with open_archive() as zf:
+        members = zf.infolist()
+        if len(members) < parallel_threshold:
+            zf.extractall(dest)
+            return
+
+    # Create directories up front so workers never race on os.makedirs()
+    for member in members:
+        parent = os.path.dirname(member.filename)
+        if parent and not os.path.isabs(parent) and ".." not in parent.split("/"):
+            os.makedirs(os.path.join(dest, parent), exist_ok=True)
+
+    workers = min(os.cpu_count() or 1, len(members))
+
+    def extract_batch(batch: List[zipfile.ZipInfo]) -> None:
+        with open_archive() as zf:
+            for member in batch:
+                zf.extract(member, dest)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # list() re-raises the first extraction error, if any
+        list(pool.map(extract_batch, [members[i::workers] for i in range(workers)]))
+
+_SIZE_SUFFIXES = ("B", "KB", "MB", "GB", "TB", "PB")
 
 def format_size(size_bytes: int) -> str:
-    """Convert bytes to human readable format."""
-    return humanize.naturalsize(size_bytes)
+    """Convert bytes to human readable format (1 KB = 1024 B)."""
+    size_bytes = max(int(size_bytes), 0)
+    # bit_length() picks the 1024-power bucket without a division loop
+    index = min(max(size_bytes.bit_length() - 1, 0) // 10, len(_SIZE_SUFFIXES) - 1)
+    if index == 0:
+        return f"{size_bytes} B"
+    return f"{size_bytes / (1 << (index * 10)):.1f} {_SIZE_SUFFIXES[index]}"
 
 def format_speed(speed_bytes: float) -> str:
     """Format download speed in human readable format."""
-    return f"{humanize.naturalsize(speed_bytes)}/s"
+    return f"{format_size(speed_bytes)}/s"
 
 def format_time(seconds: int) -> str:
-    """Format seconds into human readable time."""
-    return humanize.naturaltime(seconds)
+    """Format a duration in seconds, e.g. '45s', '3m 20s', '1h 05m'."""
+    seconds = max(int(seconds), 0)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
 
 def is_valid_game_id(game_id: str) -> bool:
     """Validate if the input is a valid Steam game ID."""
-    try:
-        return bool(int(game_id))
-    except ValueError:
-        return False
+    # AppIDs are non-zero unsigned 32-bit integers: at most 10 ASCII digits
+    return (
+        bool(game_id)
+        and len(game_id) <= 10
+        and game_id.isascii()
+        and game_id.isdigit()
+        and game_id.strip("0") != ""
+    )
 
 def extract_game_id(url: str) -> Optional[int]:
     """Extract game ID from Steam store URL."""
-    import re
-    pattern = r'store.steampowered.com/app/(\d+)'
-    match = re.search(pattern, url)
+    match = APPID_URL_RE.search(url)
     return int(match.group(1)) if match else None 
\ No newline at end of file
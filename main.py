@@ -3,11 +3,15 @@ import os
 import subprocess
 import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import zipfile
 import tarfile
 import platform
 import time
 import logging
+import logging.handlers
+import atexit
 import json
 import threading
 import sys
@@ -17,20 +21,24 @@ import psutil
 import uvicorn
 from fastapi import FastAPI
 import asyncio
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Deque, Dict, Any, Tuple, Optional
+from collections import OrderedDict, deque
 from queue import Queue
 import signal
 import uuid
 import math
 import concurrent.futures
 import socket
-import urllib.request
 import traceback
 import stat
 import tempfile
 
 # Define constants
 SETTINGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "settings.json")
+# Steam store lookups are remembered in memory and on disk for this long
+APPID_CACHE_FILE = os.path.join(os.path.dirname(SETTINGS_FILE), "appid_cache.json")
+APPID_CACHE_TTL = 3600
+APPID_CACHE_SIZE = 1024
 
 # Set download directory based on environment
 if os.environ.get('STEAM_DOWNLOAD_PATH'):
@@ -55,6 +63,89 @@ except Exception as e:
 
 STEAMCMD_PATH = None  # Will be set later
 
+# SteamCMD manager singleton, or the reason steamcmd_manager failed to import.
+# Python doesn't cache failed imports, so without this every download would
+# search sys.path again before falling back.
+_steamcmd_manager = None
+_steamcmd_manager_lock = threading.Lock()
+
+def get_steamcmd_manager():
+    """Return the SteamCMD manager instance, raising ImportError if it is unavailable."""
+    global _steamcmd_manager
+    with _steamcmd_manager_lock:
+        if _steamcmd_manager is None:
+            try:
+                import steamcmd_manager
+                _steamcmd_manager = steamcmd_manager.get_instance()
+            except ImportError as e:
+                _steamcmd_manager = str(e)
+        manager = _steamcmd_manager
+    if isinstance(manager, str):
+        raise ImportError(manager)
+    return manager
+
+# (connect, read) timeouts for archive downloads; a stalled CDN connection
+# fails instead of hanging the installer forever
+DOWNLOAD_TIMEOUT = (5, 30)
+# Bytes per read/write when extracting SteamCMD archives
+EXTRACT_CHUNK = 1 << 20
+# Gradio events handled at once. The queue defaults to one, which runs every
+# user's game check and Steam API round trip back to back; kept within the
+# HTTP pool size so concurrent lookups each get a kept-alive connection.
+UI_CONCURRENCY = 8
+# Steam API lookups in flight at once for a bulk game check; low enough to
+# stay clear of the store API's rate limit
+VALIDATE_CONCURRENCY = 5
+
+# Shared by all Steam store and CDN traffic so repeated calls reuse pooled
+# keep-alive connections instead of a new TLS handshake each. Transient
+# gateway errors and dropped connections are retried here rather than
+# surfacing as a failed lookup or SteamCMD install. Once retries are used up
+# the last response is returned as-is so callers see the real status code.
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=2, connect=2, read=1, backoff_factor=0.5, status_forcelist=(429, 502, 503, 504),
+        raise_on_status=False
+    )
+))
+http_session.headers["User-Agent"] = "SteamGamesDownloader/1.0"
+atexit.register(http_session.close)
+
+def extract_tar_url(url, dest_dir, members=None):
+    """Extract a .tar.gz into dest_dir straight from the HTTP response.
+
+    The archive is read as a stream ('r|gz'), so it is never written to disk
+    and read back; both the stream and the per-member copies move
+    EXTRACT_CHUNK bytes at a time. members, if given, limits extraction to
+    those names.
+    """
+    with http_session.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        response.raise_for_status()
+        with tarfile.open(fileobj=response.raw, mode='r|gz', bufsize=EXTRACT_CHUNK,
+                          copybufsize=EXTRACT_CHUNK) as tar:
+            if members is None:
+                tar.extractall(dest_dir)
+                return
+            for member in tar:
+                if member.name in members:
+                    tar.extract(member, dest_dir)
+
+# Elapsed-time limits for the monitoring thread, in monotonic nanoseconds
+NS_PER_SECOND = 1_000_000_000
+STARTING_TIMEOUT_NS = 600 * NS_PER_SECOND  # SteamCMD never produced output
+COMPLETED_LINGER_NS = 60 * NS_PER_SECOND   # keep finished downloads visible
+
+# System metrics shown with the download status are re-read at most this often
+SYSTEM_METRICS_TTL_NS = 5 * NS_PER_SECOND
+BOOT_TIME = datetime.fromtimestamp(psutil.boot_time())
+# cpu_percent(interval=None) reports usage since its previous call and
+# returns a meaningless 0.0 the first time; prime it so the first snapshot
+# is real without blocking on a sampling interval
+psutil.cpu_percent(interval=None)
+
 # Global variables
 active_downloads = {}  # Store active downloads
 monitoring_thread_running = False  # Flag for monitoring thread
@@ -68,7 +159,7 @@ def handle_download(appid, game_name, target_dir=None):
 
     try:
         # Generate a unique download ID
-        download_id = f"dl_{appid}_{int(time.time())}"
+        download_id = f"dl_{appid}_{time.time_ns()}"
         
         # Set default download directory if not specified
         if not target_dir:
@@ -96,6 +187,7 @@ def handle_download(appid, game_name, target_dir=None):
             "speed": "0 MB/s",
             "eta": "Calculating...",
             "start_time": time.time(),
+            "start_ns": time.monotonic_ns(),
             "target_dir": target_dir,
             "process": None,
         }
@@ -144,7 +236,7 @@ def handle_queue(game_input_text, username_val, password_val, guard_code_val,
                 "anonymous": anonymous_val,
                 "appid": appid,
                 "validate": validate_val,
-                "added_time": datetime.now()
+                "added_time": time.time()
             })
             logging.info(f"Added download for AppID {appid} to queue at position {position}")
         
@@ -159,22 +251,38 @@ log_level = os.environ.get('LOG_LEVEL', 'INFO')
 log_dir = '/app/logs' if os.path.exists('/app/logs') else '.'
 log_file = os.path.join(log_dir, 'steam_downloader.log')
 
-logging.basicConfig(
-    level=getattr(logging, log_level),
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+log_handlers = [
+    logging.FileHandler(log_file, delay=True),
+    logging.StreamHandler(sys.stdout)
+]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+
+# Callers only enqueue records; the listener thread does the file and console
+# writes, so request handlers and download threads never wait on log I/O
+log_queue = Queue()
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+root_logger = logging.getLogger()
+# The module-level logging.info() calls above already installed a default
+# stderr handler; replace it rather than logging every record twice
+for handler in root_logger.handlers[:]:
+    root_logger.removeHandler(handler)
+    handler.close()
+root_logger.setLevel(getattr(logging, log_level))
+root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
 logger = logging.getLogger(__name__)
 logger.info(f"Starting Steam Downloader application (PID: {os.getpid()})")
 
 # Global variables for download management
 download_queue = []
-download_history: List[dict] = []  # Track completed downloads
 MAX_HISTORY_SIZE = 50  # Maximum entries in download history
+# Track completed downloads; the oldest entry is evicted once the limit is hit
+download_history: Deque[dict] = deque(maxlen=MAX_HISTORY_SIZE)
 
 # Environment variable handling for containerization
 STEAM_DOWNLOAD_PATH = os.environ.get('STEAM_DOWNLOAD_PATH', '/data/downloads')
@@ -194,7 +302,7 @@ def api_get_downloads():
     return {
         "active": active_downloads,
         "queue": download_queue,
-        "history": download_history
+        "history": list(download_history)
     }
 
 def update_share_url(share_url):
@@ -271,6 +379,28 @@ def handle_game_check(input_text):
             f"Error checking game details: {str(e)}"
         ]
 
+# Separators between entries in a bulk game check
+BULK_INPUT_SPLIT_RE = re.compile(r'[\s,]+')
+
+def handle_bulk_check(input_text):
+    """Check several games at once from IDs or URLs separated by commas or whitespace."""
+    entries = [entry for entry in BULK_INPUT_SPLIT_RE.split(input_text or "") if entry]
+    appids = list(dict.fromkeys(filter(None, map(parse_game_input, entries))))
+    if not appids:
+        return "Invalid input. Please enter one or more Steam AppIDs or URLs."
+    
+    lines = []
+    for appid, (is_valid, game_info) in zip(appids, validate_appids(appids)):
+        if is_valid:
+            lines.append(f"{appid}: {game_info.get('name', f'Game {appid}')}")
+        else:
+            lines.append(f"{appid}: invalid ({game_info})")
+    
+    invalid = len(entries) - len(appids)
+    if invalid > 0:
+        lines.append(f"{invalid} entries skipped (not an AppID/URL, or repeated)")
+    return "\n".join(lines)
+
 def get_default_download_location():
     """Get the default download location based on platform"""
     home = os.path.expanduser("~")
@@ -281,6 +411,9 @@ def get_default_download_location():
     else:  # Linux and other Unix-like systems
         return os.path.join(home, "SteamLibrary")
 
+# Steam store URL -> AppID, compiled once instead of on every parse
+STORE_URL_RE = re.compile(r'store\.steampowered\.com/app/(\d+)')
+
 def parse_game_input(input_str):
     """Extract a Steam AppID from user input (ID or URL)."""
     if not input_str or not isinstance(input_str, str):
@@ -293,23 +426,16 @@ def parse_game_input(input_str):
         return input_str
     
     # Check if it's a Steam store URL
-    url_pattern = re.compile(r'store\.steampowered\.com/app/(\d+)')
-    match = url_pattern.search(input_str)
-    if match:
-        return match.group(1)
-    
-    return None
+    match = STORE_URL_RE.search(input_str)
+    return match.group(1) if match else None
 
 def get_steamcmd_path():
     """Get the path to SteamCMD using the SteamCMD manager"""
     global STEAMCMD_PATH
     
     try:
-        # Import the SteamCMD manager module
-        import steamcmd_manager
-        
         # Get the SteamCMD manager instance
-        manager = steamcmd_manager.get_instance()
+        manager = get_steamcmd_manager()
         
         # Get the path from the manager
         STEAMCMD_PATH = manager.steamcmd_path
@@ -365,17 +491,89 @@ def get_steamcmd_path():
         STEAMCMD_PATH = default_path
         return default_path
 
+# appid -> (time.time() of the lookup, game info), least recently used first;
+# loaded from APPID_CACHE_FILE on first use
+_appid_cache = None
+_appid_cache_lock = threading.Lock()
+# Serializes writes of APPID_CACHE_FILE so concurrent lookups never race on
+# the temporary file or replace a newer cache with an older snapshot
+_appid_cache_write_lock = threading.Lock()
+
+def _load_appid_cache():
+    """Read the on-disk AppID cache, dropping entries that have expired."""
+    cache = OrderedDict()
+    try:
+        with open(APPID_CACHE_FILE, 'r') as f:
+            entries = json.load(f)
+        now = time.time()
+        for appid, (ts, game_info) in entries.items():
+            if now - ts < APPID_CACHE_TTL:
+                cache[appid] = (ts, game_info)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable AppID cache: {str(e)}")
+    return cache
+
+def get_cached_game_info(appid):
+    """Return cached game info for appid if it is still fresh, else None."""
+    global _appid_cache
+    with _appid_cache_lock:
+        if _appid_cache is None:
+            _appid_cache = _load_appid_cache()
+        entry = _appid_cache.get(appid)
+        if entry is None:
+            return None
+        if time.time() - entry[0] >= APPID_CACHE_TTL:
+            del _appid_cache[appid]
+            return None
+        _appid_cache.move_to_end(appid)
+        return entry[1]
+
+def cache_game_info(appid, game_info):
+    """Remember game info for appid in memory and persist the cache to disk."""
+    global _appid_cache
+    with _appid_cache_lock:
+        if _appid_cache is None:
+            _appid_cache = _load_appid_cache()
+        _appid_cache[appid] = (time.time(), game_info)
+        _appid_cache.move_to_end(appid)
+        while len(_appid_cache) > APPID_CACHE_SIZE:
+            _appid_cache.popitem(last=False)
+    
+    # Written via a temporary file so a crash never leaves a truncated cache;
+    # the snapshot is taken inside the write lock so the last write is newest
+    with _appid_cache_write_lock:
+        with _appid_cache_lock:
+            snapshot = dict(_appid_cache)
+        try:
+            tmp_path = f"{APPID_CACHE_FILE}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, APPID_CACHE_FILE)
+        except Exception as e:
+            logging.warning(f"Could not save AppID cache: {str(e)}")
+
 def validate_appid(appid):
-    """Validate that an AppID exists and get basic information about it from Steam API."""
+    """Validate that an AppID exists and get basic information about it from Steam API.
+
+    Successful lookups are cached for APPID_CACHE_TTL seconds, so re-checking
+    a game skips the Steam API round trip.
+    """
     try:
         logging.info(f"Validating AppID: {appid}")
         if not appid.isdigit():
             return False, "AppID must be a number"
         
+        game_info = get_cached_game_info(appid)
+        if game_info is not None:
+            logging.info(f"Using cached info for game {game_info['name']} (AppID: {appid})")
+            return True, game_info
+        
         # Fetch game details from Steam Store API
         try:
             url = f"https://store.steampowered.com/api/appdetails?appids={appid}"
-            response = requests.get(url, timeout=10)
+            response = http_session.get(url, timeout=10)
             
             if response.status_code != 200:
                 logging.error(f"Steam API returned status code {response.status_code}")
@@ -404,6 +602,7 @@ def validate_appid(appid):
             }
             
             logging.info(f"Successfully retrieved info for game {game_info['name']} (AppID: {appid})")
+            cache_game_info(appid, game_info)
             return True, game_info
             
         except requests.exceptions.RequestException as e:
@@ -421,6 +620,20 @@ def validate_appid(appid):
         logging.error(f"Error validating AppID {appid}: {str(e)}", exc_info=True)
         return False, str(e)
 
+def validate_appids(appids):
+    """Validate several AppIDs concurrently, returning validate_appid() results in order.
+
+    At most VALIDATE_CONCURRENCY lookups run at once over the shared session;
+    a 429 from Steam is retried by the session after its Retry-After delay.
+    """
+    if len(appids) <= 1:
+        return [validate_appid(appid) for appid in appids]
+    
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(VALIDATE_CONCURRENCY, len(appids))
+    ) as pool:
+        return list(pool.map(validate_appid, appids))
+
 def format_size(size_bytes):
     """Format a size in bytes to a human-readable string."""
     if size_bytes < 1024:
@@ -445,12 +658,15 @@ def download_and_save_image(url, appid):
         # Generate image path
         img_path = os.path.join(img_dir, f"game_{appid}.jpg")
         
-        # Download and save the image
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            with open(img_path, 'wb') as f:
-                f.write(response.content)
-            return img_path
+        # Download and save the image, streaming it straight to disk in
+        # 64 KiB pieces; the raw stream is decoded so a gzip-encoded response
+        # isn't saved compressed
+        with http_session.get(url, stream=True, timeout=10) as response:
+            if response.status_code == 200:
+                response.raw.decode_content = True
+                with open(img_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, 64 * 1024)
+                return img_path
             
         return None
     except Exception as e:
@@ -467,7 +683,7 @@ def start_download(username, password, guard_code, anonymous, appid, validate_do
     """Start a download with the given parameters"""
     try:
         # Create a unique ID for this download
-        download_id = f"dl_{appid}_{int(time.time())}"
+        download_id = f"dl_{appid}_{time.time_ns()}"
         
         # Create download directory
         target_dir = os.path.join(DOWNLOAD_DIR, "steamapps", "common", f"app_{appid}")
@@ -493,6 +709,7 @@ def start_download(username, password, guard_code, anonymous, appid, validate_do
             "speed": "0 MB/s",
             "eta": "Calculating...",
             "start_time": time.time(),
+            "start_ns": time.monotonic_ns(),
             "target_dir": target_dir,
             "process": None,
         }
@@ -522,6 +739,16 @@ def start_download(username, password, guard_code, anonymous, appid, validate_do
         logging.error(f"Error starting download: {str(e)}", exc_info=True)
         return None
 
+# SteamCMD progress, speed and ETA fields, found in a single scan per line;
+# the outer group names which field matched
+MONITOR_LINE_RE = re.compile(
+    r'(?P<progress>progress:?\s*(?P<percent>\d+\.\d+)\s*%)'
+    r'|(?P<speed>(?P<speed_value>\d+\.\d+)\s*(?P<speed_unit>[KMG]B)/s)'
+    r'|(?P<eta>ETA:?\s*(?P<eta_value>\d+\w\s*\d+\w|\d+:\d+:\d+))'
+)
+# Lines worth logging in full, matched without lowercasing each line
+MONITOR_LOG_KEYWORD_RE = re.compile(r'error|progress|eta|download', re.IGNORECASE)
+
 def monitor_download(download_id, process):
     """Monitor the download process and update progress."""
     logging.info(f"Starting to monitor download {download_id}")
@@ -533,9 +760,6 @@ def monitor_download(download_id, process):
                 active_downloads[download_id]["status"] = "Initializing SteamCMD..."
         
         last_update_time = time.time()
-        progress_pattern = re.compile(r'progress:?\s*(\d+\.\d+)\s*%')
-        speed_pattern = re.compile(r'(\d+\.\d+)\s*([KMG]B)/s')
-        eta_pattern = re.compile(r'ETA:?\s*(\d+\w\s*\d+\w|\d+:\d+:\d+)')
         
         # Log the first 10 lines to help with debugging
         initial_lines = []
@@ -569,53 +793,45 @@ def monitor_download(download_id, process):
                 logging.info(f"SteamCMD initial output line {line_count}: {line}")
             
             # Log the output line every 5 seconds or if it contains important info
-            if current_time - last_update_time > 5 or any(kw in line.lower() for kw in ["error", "progress", "eta", "download"]):
+            if current_time - last_update_time > 5 or MONITOR_LOG_KEYWORD_RE.search(line):
                 logging.info(f"Download {download_id} output: {line}")
                 last_update_time = current_time
             
-            # Extract progress information
-            progress_match = progress_pattern.search(line)
-            if progress_match:
-                progress = float(progress_match.group(1))
-                logging.info(f"Detected progress: {progress}%")
-                with queue_lock:
-                    if download_id in active_downloads:
-                        active_downloads[download_id]["progress"] = progress
-                        active_downloads[download_id]["status"] = "Downloading"
-            
-            # Extract speed information
-            speed_match = speed_pattern.search(line)
-            if speed_match:
-                speed_value = float(speed_match.group(1))
-                speed_unit = speed_match.group(2)
-                logging.info(f"Detected speed: {speed_value} {speed_unit}/s")
-                with queue_lock:
-                    if download_id in active_downloads:
-                        active_downloads[download_id]["speed"] = f"{speed_value} {speed_unit}/s"
+            # Per-line updates are made without queue_lock: the entry is
+            # fetched with a single dict.get() and changed with single item
+            # assignments or one dict.update() call, each atomic under the
+            # CPython GIL. Readers only ever see a complete value, and an
+            # entry removed meanwhile is simply skipped.
+            download = active_downloads.get(download_id)
+            if download is None:
+                continue
             
-            # Extract ETA information
-            eta_match = eta_pattern.search(line)
-            if eta_match:
-                eta = eta_match.group(1)
-                logging.info(f"Detected ETA: {eta}")
-                with queue_lock:
-                    if download_id in active_downloads:
-                        active_downloads[download_id]["eta"] = eta
+            # Extract progress, speed and ETA information
+            for match in MONITOR_LINE_RE.finditer(line):
+                field = match.lastgroup
+                if field == "progress":
+                    progress = float(match.group("percent"))
+                    logging.info(f"Detected progress: {progress}%")
+                    download.update(progress=progress, status="Downloading")
+                elif field == "speed":
+                    speed_value = float(match.group("speed_value"))
+                    speed_unit = match.group("speed_unit")
+                    logging.info(f"Detected speed: {speed_value} {speed_unit}/s")
+                    download["speed"] = f"{speed_value} {speed_unit}/s"
+                else:
+                    eta = match.group("eta_value")
+                    logging.info(f"Detected ETA: {eta}")
+                    download["eta"] = eta
             
             # Check for successful completion
             if "Success! App" in line and "fully installed" in line:
                 logging.info(f"Download {download_id} completed successfully")
-                with queue_lock:
-                    if download_id in active_downloads:
-                        active_downloads[download_id]["progress"] = 100.0
-                        active_downloads[download_id]["status"] = "Completed"
+                download.update(progress=100.0, status="Completed")
             
             # Check for errors
             if "ERROR!" in line:
                 logging.error(f"Error in download {download_id}: {line}")
-                with queue_lock:
-                    if download_id in active_downloads:
-                        active_downloads[download_id]["status"] = f"Error: {line}"
+                download["status"] = f"Error: {line}"
         
         # If we got here, the process has completed
         logging.info(f"Finished reading output for download {download_id}")
@@ -658,98 +874,120 @@ def remove_completed_download(download_id):
             logging.info(f"Removing completed download {download_id} from active downloads")
             del active_downloads[download_id]
 
+# Seconds SteamCMD gets to exit after SIGTERM before it is killed
+CANCEL_KILL_DELAY = 3.0
+
+def _kill_if_running(download_id, process):
+    """Escalate a cancel to SIGKILL if the process ignored SIGTERM."""
+    if process.poll() is None:
+        logging.warning(f"Process for download {download_id} didn't terminate, killing forcefully")
+        try:
+            process.kill()
+        except OSError:
+            pass
+
 def cancel_download(download_id):
-    """Cancel an active download."""
+    """Cancel an active download.
+
+    Only the removal from active_downloads happens under queue_lock; the
+    process is signalled afterwards and never waited on here. Whichever
+    reader drains its output reaps it once the pipe closes.
+    """
     logging.info(f"Attempting to cancel download: {download_id}")
     
     with queue_lock:
-        if download_id not in active_downloads:
-            return f"Download {download_id} not found"
-        
-        process = active_downloads[download_id].get("process")
-        if not process:
-            del active_downloads[download_id]
-            return f"Download {download_id} cancelled (no process was running)"
-        
-        # Try to terminate the process
-        try:
-            process.terminate()
-            active_downloads[download_id]["status"] = "Cancelling..."
-            
-            # Wait a bit for graceful termination
-            def check_if_terminated():
-                if process.poll() is None:  # Process still running
-                    logging.warning(f"Process for download {download_id} didn't terminate, killing forcefully")
-                    try:
-                        process.kill()
-                    except:
-                        pass
-                
-            with queue_lock:
-                if download_id in active_downloads:
-                    del active_downloads[download_id]
-            
-            # Process next download in queue
-            process_download_queue()
-            
-            return f"Download {download_id} is being cancelled"
-            
-        except Exception as e:
-            logging.error(f"Error cancelling download {download_id}: {str(e)}", exc_info=True)
-            
-            with queue_lock:
-                if download_id in active_downloads:
-                    active_downloads[download_id]["status"] = "Failed to cancel"
-            
-            return f"Error cancelling download {download_id}: {str(e)}"
+        download = active_downloads.pop(download_id, None)
+    
+    if download is None:
+        return f"Download {download_id} not found"
+    
+    # Legacy downloads keep their Popen under "process", reactor-driven ones
+    # under "steamcmd_process"
+    process = download.get("process") or download.get("steamcmd_process")
+    if not process:
+        return f"Download {download_id} cancelled (no process was running)"
+    
+    try:
+        process.terminate()
+        # Daemon, so exiting right after a cancel doesn't wait out the delay
+        kill_timer = threading.Timer(CANCEL_KILL_DELAY, _kill_if_running, args=(download_id, process))
+        kill_timer.daemon = True
+        kill_timer.start()
+    except Exception as e:
+        logging.error(f"Error cancelling download {download_id}: {str(e)}", exc_info=True)
+        return f"Error cancelling download {download_id}: {str(e)}"
+    
+    # Process next download in queue
+    process_download_queue()
+    
+    return f"Download {download_id} is being cancelled"
+
+_system_metrics = {"expires_ns": 0, "snapshot": None}
+_system_metrics_lock = threading.Lock()
+
+def get_system_metrics():
+    """Return a snapshot of system usage, refreshed at most every SYSTEM_METRICS_TTL_NS."""
+    with _system_metrics_lock:
+        now_ns = time.monotonic_ns()
+        if now_ns >= _system_metrics["expires_ns"]:
+            _system_metrics["snapshot"] = {
+                "cpu_usage": psutil.cpu_percent(interval=None),
+                "memory_usage": psutil.virtual_memory().percent,
+                "disk_usage": psutil.disk_usage('/').percent,
+                "network_speed": "N/A",
+                "uptime": str(datetime.now() - BOOT_TIME).split('.')[0]
+            }
+            _system_metrics["expires_ns"] = now_ns + SYSTEM_METRICS_TTL_NS
+        return _system_metrics["snapshot"]
 
 def get_download_status():
     """Get the current status of downloads and queue."""
     result = {
         "active": [],
         "queue": [],
-        "system": {
-            "cpu_usage": psutil.cpu_percent(),
-            "memory_usage": psutil.virtual_memory().percent,
-            "disk_usage": psutil.disk_usage('/').percent,
-            "network_speed": "N/A",
-            "uptime": str(datetime.now() - datetime.fromtimestamp(psutil.boot_time())).split('.')[0]
-        },
+        "system": get_system_metrics(),
         "history": []  # You can implement history tracking if needed
     }
     
+    # Snapshot under the lock and format outside it, so the monitor threads
+    # are only held up for the shallow copies
+    with queue_lock:
+        active = [(id, info.copy()) for id, info in active_downloads.items()]
+        queued = list(download_queue)
+    
     # First, log the current state for debugging
-    logging.info(f"Current active_downloads: {len(active_downloads)} items")
-    for id, info in active_downloads.items():
+    logging.info(f"Current active_downloads: {len(active)} items")
+    for id, info in active:
         status_copy = info.copy()
-        if "process" in status_copy:
-            del status_copy["process"]  # Remove process object before logging
+        # Remove process objects before logging
+        status_copy.pop("process", None)
+        status_copy.pop("steamcmd_process", None)
         logging.info(f"Download {id} status: {status_copy}")
     
     # Now populate the result
-    with queue_lock:
-        for id, info in active_downloads.items():
-            result["active"].append({
-                "id": id,
-                "name": info["name"],
-                "appid": info["appid"],
-                "progress": info["progress"],
-                "status": info["status"],
-                "eta": info["eta"],
-                "runtime": str(datetime.now() - info["start_time"]).split('.')[0],  # Remove microseconds
-                "speed": info.get("speed", "Unknown"),
-                "size_downloaded": info.get("size_downloaded", "Unknown"),
-                "total_size": info.get("total_size", "Unknown")
-            })
-        
-        # Queue information
-        for i, download in enumerate(download_queue):
-            result["queue"].append({
-                "position": i + 1,
-                "appid": download["appid"],
-                "name": f"Game (AppID: {download['appid']})",
-                "validate": download["validate"]
-            })
+    now_ns = time.monotonic_ns()
+    for id, info in active:
+        result["active"].append({
+            "id": id,
+            "name": info["name"],
+            "appid": info["appid"],
+            "progress": info["progress"],
+            "status": info["status"],
+            "eta": info["eta"],
+            "runtime": str(timedelta(seconds=(now_ns - info["start_ns"]) // NS_PER_SECOND)),
+            "speed": info.get("speed", "Unknown"),
+            "size_downloaded": info.get("size_downloaded", "Unknown"),
+            "total_size": info.get("total_size", "Unknown")
+        })
+    
+    # Queue information
+    for i, download in enumerate(queued):
+        result["queue"].append({
+            "position": i + 1,
+            "appid": download["appid"],
+            "name": f"Game (AppID: {download['appid']})",
+            "validate": download["validate"]
+        })
     
     return result
 
@@ -850,7 +1088,9 @@ def create_download_games_tab():
                         info="Enter a valid Steam game ID or store URL"
                     )
                     
-                check_button = gr.Button("Check Game Details", variant="secondary")
+                with gr.Row():
+                    check_button = gr.Button("Check Game Details", variant="secondary")
+                    bulk_check_button = gr.Button("Check Multiple Games", variant="secondary")
                 
                 game_info_json = gr.JSON(visible=False)
                 
@@ -936,6 +1176,12 @@ def create_download_games_tab():
                      game_description, game_size, status_box]
         )
         
+        bulk_check_button.click(
+            fn=handle_bulk_check,
+            inputs=game_input,
+            outputs=[status_box]
+        )
+        
         download_button.click(
             fn=download_handler,
             inputs=[game_input, username, password, guard_code, anonymous_login, 
@@ -1281,12 +1527,9 @@ def install_steamcmd():
     try:
         logging.info("Installing SteamCMD using SteamCMD manager")
         
-        # Import the SteamCMD manager module
         try:
-            import steamcmd_manager
-            
             # Get the SteamCMD manager instance
-            manager = steamcmd_manager.get_instance()
+            manager = get_steamcmd_manager()
             
             # Install SteamCMD
             if manager.install():
@@ -1325,18 +1568,13 @@ def _legacy_install_steamcmd():
 
         # Try to download steamcmd directly
         try:
-            logging.info("Downloading SteamCMD archive")
-            # Use urllib instead of wget since wget might not be available
-            tar_path = os.path.join(steamcmd_dir, "steamcmd_linux.tar.gz")
-            urllib.request.urlretrieve(
+            logging.info("Downloading and extracting SteamCMD archive")
+            # Download in-process since wget might not be available
+            extract_tar_url(
                 "https://steamcdn-a.akamaihd.net/client/installer/steamcmd_linux.tar.gz", 
-                tar_path
+                steamcmd_dir
             )
             
-            logging.info("Extracting SteamCMD")
-            with tarfile.open(tar_path, 'r:gz') as tar_ref:
-                tar_ref.extractall(steamcmd_dir)
-            
             if not os.path.exists("steamcmd.sh"):
                 logging.error("Failed to extract steamcmd.sh")
                 return False
@@ -1424,7 +1662,7 @@ def test_steam_api():
     try:
         # Test a simple Steam API call
         test_url = "https://api.steampowered.com/ISteamApps/GetAppList/v2/"
-        response = requests.get(test_url, timeout=5)
+        response = http_session.get(test_url, timeout=5)
         if response.status_code == 200:
             return "Steam API connection successful"
         else:
@@ -1518,27 +1756,17 @@ def fix_missing_steamcmd_binary():
         linux32_dir = os.path.join(steamcmd_dir, "linux32")
         os.makedirs(linux32_dir, exist_ok=True)
         
-        # Download SteamCMD archive
-        tar_path = os.path.join(steamcmd_dir, "steamcmd_linux.tar.gz")
-        urllib.request.urlretrieve(
+        # Extract only the steamcmd file, directly into the linux32 directory
+        extract_tar_url(
             "https://steamcdn-a.akamaihd.net/client/installer/steamcmd_linux.tar.gz", 
-            tar_path
+            linux32_dir,
+            members={"steamcmd"}
         )
-        
-        # Extract directly into the linux32 directory
-        with tarfile.open(tar_path, 'r:gz') as tar_ref:
-            for member in tar_ref.getmembers():
-                # Extract only the steamcmd file
-                if member.name == "steamcmd":
-                    member.name = "steamcmd"  # Ensure correct filename
-                    tar_ref.extract(member, linux32_dir)
-                    # Make it executable
-                    bin_path = os.path.join(linux32_dir, "steamcmd")
-                    os.chmod(bin_path, 0o755)
-                    logging.info(f"Extracted steamcmd binary to {bin_path}")
-        
-        # Clean up
-        os.remove(tar_path)
+        bin_path = os.path.join(linux32_dir, "steamcmd")
+        if os.path.exists(bin_path):
+            # Make it executable
+            os.chmod(bin_path, 0o755)
+            logging.info(f"Extracted steamcmd binary to {bin_path}")
         
         # Create a simplified steamcmd.sh script
         with open(steamcmd_path, 'w') as f:
@@ -1585,8 +1813,7 @@ def start_download_process(download_id, appid, target_dir):
         
         # Try to use the SteamCMD manager for downloading
         try:
-            import steamcmd_manager
-            manager = steamcmd_manager.get_instance()
+            manager = get_steamcmd_manager()
             
             if not manager.is_installed():
                 logging.warning("SteamCMD not installed. Attempting to install...")
@@ -1603,24 +1830,38 @@ def start_download_process(download_id, appid, target_dir):
                     active_downloads[download_id]["status"] = "Failed - Could not reinstall SteamCMD"
                     return
             
-            # Set up a thread to monitor the download progress
-            def monitor_download_thread():
-                active_downloads[download_id]["status"] = "Starting download..."
-                success, output = manager.download_game(appid, target_dir, validate=False)
-                
-                if success:
+            def download_finished(success, output):
+                download = active_downloads.get(download_id)
+                if download is None:
+                    # Cancelled; the entry is already gone
+                    logging.info(f"Download {download_id} exited after cancellation")
+                elif success:
                     logging.info(f"Download completed successfully for {download_id}")
-                    active_downloads[download_id]["progress"] = 100
-                    active_downloads[download_id]["status"] = "Completed"
-                    active_downloads[download_id]["speed"] = "0 MB/s"
-                    active_downloads[download_id]["eta"] = "Completed"
+                    download.update(progress=100, status="Completed", speed="0 MB/s", eta="Completed")
                 else:
                     logging.error(f"Download failed for {download_id}: {output}")
-                    active_downloads[download_id]["status"] = f"Failed - {output}"
+                    download["status"] = f"Failed - {output}"
+            
+            def download_spawned(process):
+                # Kept so cancel_download can signal it. Stored under its own
+                # key rather than "process": the reactor owns this process's
+                # lifecycle, so monitor_loop must not poll and finalize it.
+                download = active_downloads.get(download_id)
+                if download is not None:
+                    download["steamcmd_process"] = process
             
-            # Start the download in a separate thread
-            download_thread = threading.Thread(target=monitor_download_thread, daemon=True)
-            download_thread.start()
+            # Progress is parsed from the output as SteamCMD streams it. The
+            # manager's shared output thread drains every running download,
+            # so no thread is held here for the length of the download.
+            active_downloads[download_id]["status"] = "Starting download..."
+            process, message = manager.start_download(
+                appid, target_dir, download_finished, validate=False,
+                output_callback=lambda line: update_download_progress(download_id, line),
+                on_spawn=download_spawned
+            )
+            if process is None:
+                logging.error(f"Download failed to start for {download_id}: {message}")
+                active_downloads[download_id]["status"] = f"Failed - {message}"
             return
             
         except ImportError:
@@ -1735,10 +1976,22 @@ def start_download_process(download_id, appid, target_dir):
         if download_id in active_downloads:
             active_downloads[download_id]["status"] = f"Failed - {str(e)}"
 
+# Patterns for the progress lines update_download_progress() understands
+DONE_PERCENT_RE = re.compile(r'(\d+\.\d+)% done')
+DOWNLOAD_RATE_RE = re.compile(r'Download rate: (\d+\.\d+) ([KMG]B)/s')
+DOWNLOAD_BYTES_RE = re.compile(r'Downloading update \(([0-9,]+) of ([0-9,]+) bytes\)')
+
 def update_download_progress(download_id, line):
-    """Update download progress based on SteamCMD output"""
+    """Update download progress based on SteamCMD output.
+
+    Runs without queue_lock, like monitor_download: each download's entry has
+    a single writer, the entry is looked up once, and every change is a
+    single item assignment. If the download is cancelled meanwhile, the
+    detached entry is updated harmlessly instead of raising KeyError.
+    """
     try:
-        if download_id not in active_downloads:
+        download = active_downloads.get(download_id)
+        if download is None:
             return
             
         # Example patterns to look for in SteamCMD output:
@@ -1750,30 +2003,30 @@ def update_download_progress(download_id, line):
         logging.debug(f"SteamCMD output: {line}")
         
         # Pattern 1: Progress percentage
-        progress_match = re.search(r'(\d+\.\d+)% done', line)
+        progress_match = DONE_PERCENT_RE.search(line)
         if progress_match:
             progress = float(progress_match.group(1))
-            active_downloads[download_id]["progress"] = progress
+            download["progress"] = progress
             
         # Pattern 2: Download rate
-        speed_match = re.search(r'Download rate: (\d+\.\d+) ([KMG]B)/s', line)
+        speed_match = DOWNLOAD_RATE_RE.search(line)
         if speed_match:
             speed_value = float(speed_match.group(1))
             speed_unit = speed_match.group(2)
-            active_downloads[download_id]["speed"] = f"{speed_value} {speed_unit}/s"
+            download["speed"] = f"{speed_value} {speed_unit}/s"
             
         # Pattern 3: Downloading bytes indicator
-        bytes_match = re.search(r'Downloading update \(([0-9,]+) of ([0-9,]+) bytes\)', line)
+        bytes_match = DOWNLOAD_BYTES_RE.search(line)
         if bytes_match:
             current_bytes = int(bytes_match.group(1).replace(',', ''))
             total_bytes = int(bytes_match.group(2).replace(',', ''))
             
             if total_bytes > 0:
                 progress = (current_bytes / total_bytes) * 100
-                active_downloads[download_id]["progress"] = progress
+                download["progress"] = progress
                 
                 # Calculate ETA based on progress and elapsed time
-                elapsed_time = time.time() - active_downloads[download_id]["start_time"]
+                elapsed_time = (time.monotonic_ns() - download["start_ns"]) / NS_PER_SECOND
                 if progress > 0:
                     total_time_estimate = elapsed_time * (100 / progress)
                     remaining_time = total_time_estimate - elapsed_time
@@ -1788,15 +2041,15 @@ def update_download_progress(download_id, line):
                         minutes = int((remaining_time % 3600) / 60)
                         eta = f"{hours}h {minutes}m"
                         
-                    active_downloads[download_id]["eta"] = eta
+                    download["eta"] = eta
         
         # Update status based on specific messages
         if "Validating installation" in line:
-            active_downloads[download_id]["status"] = "Validating"
+            download["status"] = "Validating"
         elif "Downloading update" in line:
-            active_downloads[download_id]["status"] = "Downloading"
+            download["status"] = "Downloading"
         elif "Installing update" in line:
-            active_downloads[download_id]["status"] = "Installing"
+            download["status"] = "Installing"
             
     except Exception as e:
         logging.error(f"Error updating progress for {download_id}: {str(e)}", exc_info=True)
@@ -1822,6 +2075,7 @@ def start_monitoring_thread():
                         
                     # Check each download
                     downloads_to_remove = []
+                    now_ns = time.monotonic_ns()
                     for download_id, download_info in active_downloads.items():
                         # Check if the process is still running
                         if download_info.get("process"):
@@ -1854,13 +2108,13 @@ def start_monitoring_thread():
                                     downloads_to_remove.append(download_id)
                         
                         # Check if the download has been running for too long (10 minutes without progress)
-                        elif download_info.get("status") == "Starting" and time.time() - download_info.get("start_time", 0) > 600:
+                        elif download_info.get("status") == "Starting" and now_ns - download_info.get("start_ns", now_ns) > STARTING_TIMEOUT_NS:
                             download_info["status"] = "Failed - Timed out waiting for SteamCMD to start"
                             logging.error(f"Download {download_id} timed out waiting for SteamCMD to start")
                             downloads_to_remove.append(download_id)
                             
                         # If download is complete, mark for removal after a delay
-                        elif download_info.get("status") == "Completed" and time.time() - download_info.get("start_time", 0) > 60:
+                        elif download_info.get("status") == "Completed" and now_ns - download_info.get("start_ns", now_ns) > COMPLETED_LINGER_NS:
                             downloads_to_remove.append(download_id)
                             
                     # Remove completed downloads
@@ -1928,7 +2182,7 @@ def queue_handler(input_text, username, password, guard_code, anonymous, validat
                 "anonymous": anonymous,
                 "appid": appid,
                 "validate": validate,
-                "added_time": datetime.now()
+                "added_time": time.time()
             })
             logging.info(f"Added download for AppID {appid} to queue at position {position}")
         
@@ -2018,17 +2272,11 @@ def backup_steamcmd_approach():
         temp_dir = tempfile.mkdtemp()
         logging.info(f"Created temporary directory: {temp_dir}")
         
-        # Download the SteamCMD archive
-        steam_archive = os.path.join(temp_dir, "steamcmd.tar.gz")
-        urllib.request.urlretrieve(
+        # Download and extract the SteamCMD archive in one pass
+        extract_tar_url(
             "https://steamcdn-a.akamaihd.net/client/installer/steamcmd_linux.tar.gz", 
-            steam_archive
+            temp_dir
         )
-        logging.info(f"Downloaded SteamCMD archive to {steam_archive}")
-        
-        # Extract the archive
-        with tarfile.open(steam_archive, 'r:gz') as tar:
-            tar.extractall(temp_dir)
         logging.info(f"Extracted SteamCMD files to {temp_dir}")
         
         # Get the actual steamcmd script path
@@ -2115,7 +2363,7 @@ if __name__ == "__main__":
         print("Full interface created, launching application...")
     
     # Launch the application
-    app.queue().launch(
+    app.queue(concurrency_count=UI_CONCURRENCY).launch(
         server_port=int(os.environ.get("PORT", 8080)),  # Use standard port 8080 by default
         server_name="0.0.0.0",  # Bind to all interfaces
         share=True,  # Always enable sharing
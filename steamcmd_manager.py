@@ -14,6 +14,9 @@ import sys
 import platform
 import logging
 import subprocess
+import selectors
+import threading
+import urllib.error
 import urllib.request
 import tarfile
 import zipfile
@@ -22,6 +25,8 @@ import tempfile
 import stat
 import time
 import json
+import hashlib
+from collections import deque
 
 # Configure logging
 logging.basicConfig(
@@ -30,6 +35,167 @@ logging.basicConfig(
     handlers=[logging.StreamHandler(sys.stdout)]
 )
 
+# Lines of SteamCMD output kept for error reporting when output is streamed
+OUTPUT_TAIL_LINES = 200
+
+# Socket timeout, in seconds, for archive downloads; a stalled CDN connection
+# fails instead of hanging the installer forever
+DOWNLOAD_TIMEOUT = 30
+# Attempts per archive download; gateway errors and network failures retry
+DOWNLOAD_ATTEMPTS = 3
+RETRY_STATUS_CODES = (502, 503, 504)
+# Bytes per read/write when extracting SteamCMD archives
+EXTRACT_CHUNK = 1 << 20
+
+# Written next to steamcmd.sh after a successful verification; holds the
+# SHA-256 of the verified binary so unchanged installs skip the test run
+VERIFIED_SENTINEL = ".installed_sha256"
+
+# Bytes read per wake-up from a SteamCMD output pipe by the output reactor
+READ_CHUNK = 1 << 16
+
+def _with_retries(url, action):
+    """Call action() on a fresh response for url, retrying transient failures with backoff."""
+    for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
+        try:
+            with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+                return action(response)
+        except urllib.error.HTTPError as e:
+            if e.code not in RETRY_STATUS_CODES or attempt == DOWNLOAD_ATTEMPTS:
+                raise
+        except (urllib.error.URLError, OSError):
+            if attempt == DOWNLOAD_ATTEMPTS:
+                raise
+        logging.warning(f"Download of {url} failed (attempt {attempt}/{DOWNLOAD_ATTEMPTS}), retrying...")
+        time.sleep(0.5 * 2 ** (attempt - 1))
+
+def download_file(url, dest_path):
+    """Download url to dest_path."""
+    def save(response):
+        with open(dest_path, 'wb') as f:
+            shutil.copyfileobj(response, f, 1 << 20)
+    _with_retries(url, save)
+
+def extract_tar_url(url, dest_dir, members=None):
+    """Extract a .tar.gz into dest_dir straight from the HTTP response.
+
+    The archive is read as a stream ('r|gz'), so it is never written to disk
+    and read back; both the stream and the per-member copies move
+    EXTRACT_CHUNK bytes at a time. members, if given, limits extraction to
+    those names.
+    """
+    def extract(response):
+        with tarfile.open(fileobj=response, mode='r|gz', bufsize=EXTRACT_CHUNK,
+                          copybufsize=EXTRACT_CHUNK) as tar:
+            if members is None:
+                tar.extractall(dest_dir)
+                return
+            for member in tar:
+                if member.name in members:
+                    tar.extract(member, dest_dir)
+    _with_retries(url, extract)
+
+class _Watch:
+    """A running process whose output is drained by the reactor."""
+    __slots__ = ("process", "on_line", "on_exit", "partial", "tail")
+
+    def __init__(self, process, on_line, on_exit):
+        self.process = process
+        self.on_line = on_line
+        self.on_exit = on_exit
+        self.partial = b""
+        self.tail = deque(maxlen=OUTPUT_TAIL_LINES)
+
+class _OutputReactor:
+    """Single thread that drains the output of every running SteamCMD process.
+
+    Each process's stdout is registered with a selector; ready pipes are read
+    in READ_CHUNK pieces, split into lines for the process's line callback,
+    and at EOF the process is reaped and its exit reported. Concurrent
+    downloads share this thread instead of each holding a blocked reader.
+    Windows cannot select() on pipes, so there each process gets a reader
+    thread running the same drain loop.
+    """
+
+    def __init__(self):
+        self._selector = None
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._wake_r = self._wake_w = None
+
+    def watch(self, process, on_line, on_exit):
+        """Drain process.stdout (a binary pipe) until EOF, then call on_exit(returncode, tail)."""
+        watch = _Watch(process, on_line, on_exit)
+        if platform.system() == "Windows":
+            threading.Thread(target=self._drain_blocking, args=(watch,), daemon=True).start()
+            return
+
+        with self._lock:
+            if self._selector is None:
+                # Self-pipe: registration happens on the reactor thread,
+                # which is woken through it from the caller's thread
+                self._selector = selectors.DefaultSelector()
+                self._wake_r, self._wake_w = os.pipe()
+                os.set_blocking(self._wake_w, False)
+                self._selector.register(self._wake_r, selectors.EVENT_READ)
+                threading.Thread(target=self._run, name="steamcmd-output", daemon=True).start()
+        self._pending.append(watch)
+        try:
+            os.write(self._wake_w, b"\0")
+        except BlockingIOError:
+            pass  # A wake-up is already pending
+
+    def _run(self):
+        while True:
+            for key, _ in self._selector.select():
+                if key.data is None:
+                    os.read(self._wake_r, READ_CHUNK)
+                    while self._pending:
+                        watch = self._pending.popleft()
+                        self._selector.register(watch.process.stdout, selectors.EVENT_READ, watch)
+                elif not self._drain(key.data):
+                    self._selector.unregister(key.fileobj)
+
+    def _drain_blocking(self, watch):
+        while self._drain(watch):
+            pass
+
+    def _drain(self, watch):
+        """Handle one read from a watched pipe; returns False once it hit EOF."""
+        try:
+            data = os.read(watch.process.stdout.fileno(), READ_CHUNK)
+        except OSError as e:
+            logging.error(f"Error reading SteamCMD output: {str(e)}")
+            data = b""
+
+        if data:
+            lines = (watch.partial + data).splitlines()
+            # Keep an unterminated last line until the rest of it arrives
+            watch.partial = b"" if data[-1:] in (b"\n", b"\r") else lines.pop()
+        else:
+            lines = [watch.partial] if watch.partial else []
+
+        for line in lines:
+            line = line.decode("utf-8", "replace") + "\n"
+            watch.tail.append(line)
+            try:
+                watch.on_line(line)
+            except Exception as e:
+                logging.error(f"Error handling SteamCMD output: {str(e)}", exc_info=True)
+
+        if data:
+            return True
+
+        watch.process.stdout.close()
+        returncode = watch.process.wait()
+        try:
+            watch.on_exit(returncode, "".join(watch.tail))
+        except Exception as e:
+            logging.error(f"Error handling SteamCMD exit: {str(e)}", exc_info=True)
+        return False
+
+_reactor = _OutputReactor()
+
 class SteamCMDManager:
     """Class to manage SteamCMD installation, verification and execution"""
     
@@ -100,12 +266,43 @@ class SteamCMDManager:
         logging.info(f"SteamCMD is installed at {self.steamcmd_path}")
         return True
     
+    def _binary_path(self):
+        """Path of the actual SteamCMD executable behind the launcher script"""
+        if self.is_windows:
+            return self.steamcmd_path
+        return os.path.join(os.path.dirname(self.steamcmd_path), "linux32", "steamcmd")
+    
+    def _binary_digest(self):
+        """SHA-256 of the SteamCMD executable, or None if it can't be read"""
+        digest = hashlib.sha256()
+        try:
+            with open(self._binary_path(), 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        return digest.hexdigest()
+    
     def verify_installation(self):
-        """Verify SteamCMD installation by running a simple command"""
+        """Verify SteamCMD installation by running a simple command.
+
+        The run is skipped when the binary still matches the digest recorded
+        by the last successful verification.
+        """
         if not self.is_installed():
             logging.warning("SteamCMD not installed, cannot verify")
             return False
         
+        sentinel = os.path.join(os.path.dirname(self.steamcmd_path), VERIFIED_SENTINEL)
+        try:
+            with open(sentinel, 'r') as f:
+                verified_digest = f.read().strip()
+        except OSError:
+            verified_digest = None
+        if verified_digest and verified_digest == self._binary_digest():
+            logging.info("SteamCMD binary unchanged since last verification")
+            return True
+        
         try:
             logging.info("Verifying SteamCMD installation...")
             cmd = [self.steamcmd_path, "+quit"]
@@ -120,6 +317,14 @@ class SteamCMDManager:
             
             if process.returncode == 0:
                 logging.info("SteamCMD verification successful")
+                # Hash after the run: SteamCMD updates itself on first start
+                digest = self._binary_digest()
+                if digest:
+                    try:
+                        with open(sentinel, 'w') as f:
+                            f.write(digest)
+                    except OSError as e:
+                        logging.warning(f"Could not record SteamCMD verification: {str(e)}")
                 return True
             else:
                 logging.error(f"SteamCMD verification failed with code: {process.returncode}")
@@ -156,7 +361,7 @@ class SteamCMDManager:
             
             # Download SteamCMD zip
             logging.info("Downloading SteamCMD for Windows...")
-            urllib.request.urlretrieve(
+            download_file(
                 "https://steamcdn-a.akamaihd.net/client/installer/steamcmd.zip",
                 zip_path
             )
@@ -196,19 +401,13 @@ class SteamCMDManager:
                 except Exception as e:
                     logging.warning(f"Failed to install dependencies, but continuing anyway: {str(e)}")
             
-            # Download SteamCMD
-            tar_path = os.path.join(steamcmd_dir, "steamcmd_linux.tar.gz")
-            logging.info(f"Downloading SteamCMD archive to {tar_path}")
-            urllib.request.urlretrieve(
+            # Download and extract SteamCMD in one pass
+            logging.info(f"Downloading and extracting SteamCMD to {steamcmd_dir}")
+            extract_tar_url(
                 "https://steamcdn-a.akamaihd.net/client/installer/steamcmd_linux.tar.gz", 
-                tar_path
+                steamcmd_dir
             )
             
-            # Extract the archive
-            logging.info(f"Extracting SteamCMD to {steamcmd_dir}")
-            with tarfile.open(tar_path, 'r:gz') as tar_ref:
-                tar_ref.extractall(steamcmd_dir)
-            
             # Make steamcmd.sh executable
             os.chmod(self.steamcmd_path, 0o755)
             
@@ -224,10 +423,6 @@ class SteamCMDManager:
                     logging.error("Failed to fix SteamCMD binary")
                     return False
             
-            # Clean up
-            if os.path.exists(tar_path):
-                os.remove(tar_path)
-            
             logging.info("SteamCMD installed successfully on Linux")
             return True
             
@@ -289,27 +484,17 @@ chmod +x "$BINARY"
             linux32_dir = os.path.join(steamcmd_dir, "linux32")
             os.makedirs(linux32_dir, exist_ok=True)
             
-            # Download SteamCMD archive
-            tar_path = os.path.join(steamcmd_dir, "steamcmd_linux.tar.gz")
-            urllib.request.urlretrieve(
+            # Extract only the steamcmd file, directly into the linux32 directory
+            extract_tar_url(
                 "https://steamcdn-a.akamaihd.net/client/installer/steamcmd_linux.tar.gz", 
-                tar_path
+                linux32_dir,
+                members={"steamcmd"}
             )
-            
-            # Extract directly into the linux32 directory
-            with tarfile.open(tar_path, 'r:gz') as tar_ref:
-                for member in tar_ref.getmembers():
-                    # Extract only the steamcmd file
-                    if member.name == "steamcmd":
-                        member.name = "steamcmd"  # Ensure correct filename
-                        tar_ref.extract(member, linux32_dir)
-                        # Make it executable
-                        bin_path = os.path.join(linux32_dir, "steamcmd")
-                        os.chmod(bin_path, 0o755)
-                        logging.info(f"Extracted steamcmd binary to {bin_path}")
-            
-            # Clean up
-            os.remove(tar_path)
+            bin_path = os.path.join(linux32_dir, "steamcmd")
+            if os.path.exists(bin_path):
+                # Make it executable
+                os.chmod(bin_path, 0o755)
+                logging.info(f"Extracted steamcmd binary to {bin_path}")
             
             # Verify the binary exists
             if os.path.exists(os.path.join(linux32_dir, "steamcmd")):
@@ -332,17 +517,11 @@ chmod +x "$BINARY"
             temp_dir = tempfile.mkdtemp()
             logging.info(f"Created temporary directory: {temp_dir}")
             
-            # Download the SteamCMD archive
-            steam_archive = os.path.join(temp_dir, "steamcmd.tar.gz")
-            urllib.request.urlretrieve(
+            # Download and extract the SteamCMD archive in one pass
+            extract_tar_url(
                 "https://steamcdn-a.akamaihd.net/client/installer/steamcmd_linux.tar.gz", 
-                steam_archive
+                temp_dir
             )
-            logging.info(f"Downloaded SteamCMD archive to {steam_archive}")
-            
-            # Extract the archive
-            with tarfile.open(steam_archive, 'r:gz') as tar:
-                tar.extractall(temp_dir)
             logging.info(f"Extracted SteamCMD files to {temp_dir}")
             
             # Get the actual steamcmd script path
@@ -401,8 +580,54 @@ chmod +x "$BINARY"
             logging.error(f"Error in backup SteamCMD approach: {str(e)}", exc_info=True)
             return False
     
-    def run_command(self, args, target_dir=None, timeout=None):
-        """Run a SteamCMD command with the given arguments"""
+    def _stream_command(self, cmd, target_dir, timeout, output_callback):
+        """Run a command, handing each output line to output_callback as it arrives.
+
+        stderr is merged into stdout and drained continuously, so SteamCMD can
+        never block on a full pipe; only the last OUTPUT_TAIL_LINES lines are
+        kept for the result. The timeout is enforced by a timer that kills the
+        process, so it also fires while SteamCMD is silent.
+        """
+        tail = deque(maxlen=OUTPUT_TAIL_LINES)
+        expired = threading.Event()
+        
+        with subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            cwd=target_dir
+        ) as process:
+            timer = None
+            if timeout:
+                def expire():
+                    expired.set()
+                    process.kill()
+                
+                timer = threading.Timer(timeout, expire)
+                timer.daemon = True
+                timer.start()
+            try:
+                for line in process.stdout:
+                    tail.append(line)
+                    output_callback(line)
+                returncode = process.wait()
+            finally:
+                if timer is not None:
+                    timer.cancel()
+        
+        if expired.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout, output="".join(tail))
+        return returncode, "".join(tail)
+    
+    def run_command(self, args, target_dir=None, timeout=None, output_callback=None):
+        """Run a SteamCMD command with the given arguments.
+
+        With output_callback, output is streamed line by line while the
+        command runs instead of being collected when it exits.
+        """
         if not self.is_installed():
             logging.error("SteamCMD not installed, cannot run command")
             if not self.install():
@@ -414,22 +639,27 @@ chmod +x "$BINARY"
             
             logging.info(f"Running SteamCMD command: {' '.join(cmd)}")
             
-            process = subprocess.run(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=target_dir,
-                timeout=timeout
-            )
+            if output_callback is not None:
+                returncode, stdout = self._stream_command(cmd, target_dir, timeout, output_callback)
+                stderr = stdout
+            else:
+                process = subprocess.run(
+                    cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    cwd=target_dir,
+                    timeout=timeout
+                )
+                returncode, stdout, stderr = process.returncode, process.stdout, process.stderr
             
-            if process.returncode == 0:
+            if returncode == 0:
                 logging.info("SteamCMD command executed successfully")
-                return True, process.stdout
+                return True, stdout
             else:
-                logging.error(f"SteamCMD command failed with code: {process.returncode}")
-                logging.error(f"STDERR: {process.stderr}")
-                return False, process.stderr
+                logging.error(f"SteamCMD command failed with code: {returncode}")
+                logging.error(f"STDERR: {stderr}")
+                return False, stderr
                 
         except subprocess.TimeoutExpired:
             logging.error(f"SteamCMD command timed out after {timeout} seconds")
@@ -438,45 +668,26 @@ chmod +x "$BINARY"
             logging.error(f"Error running SteamCMD command: {str(e)}")
             return False, str(e)
     
-    def download_game(self, appid, target_dir, validate=False, login_anonymous=True, username=None, password=None, guard_code=None):
-        """Download a game using SteamCMD"""
+    def download_game(self, appid, target_dir, validate=False, login_anonymous=True, username=None, password=None, guard_code=None,
+                      output_callback=None):
+        """Download a game using SteamCMD.
+
+        output_callback, if given, receives each SteamCMD output line as the
+        download runs.
+        """
         if not self.is_installed():
             logging.error("SteamCMD not installed, cannot download game")
             if not self.install():
                 return False, "Failed to install SteamCMD"
         
         try:
-            # Create target directory if it doesn't exist
-            os.makedirs(target_dir, exist_ok=True)
-            
-            # Build command arguments
-            args = []
-            
-            # Login information
-            if login_anonymous:
-                args.extend(["+login", "anonymous"])
-            elif username and password:
-                args.extend(["+login", username, password])
-                if guard_code:
-                    args.append(guard_code)
-            else:
+            args = self._download_args(appid, target_dir, validate, login_anonymous,
+                                       username, password, guard_code)
+            if args is None:
                 return False, "Invalid login information"
             
-            # Set installation directory
-            args.extend(["+force_install_dir", target_dir])
-            
-            # App update command
-            args.extend(["+app_update", str(appid)])
-            
-            # Add validate if requested
-            if validate:
-                args.append("validate")
-            
-            # Add quit command
-            args.append("+quit")
-            
             # Run the command
-            success, output = self.run_command(args)
+            success, output = self.run_command(args, output_callback=output_callback)
             
             if success:
                 logging.info(f"Successfully downloaded game {appid} to {target_dir}")
@@ -488,6 +699,71 @@ chmod +x "$BINARY"
         except Exception as e:
             logging.error(f"Error downloading game {appid}: {str(e)}")
             return False, str(e)
+    
+    def start_download(self, appid, target_dir, on_exit, validate=False, login_anonymous=True,
+                       username=None, password=None, guard_code=None, output_callback=None,
+                       on_spawn=None):
+        """Start a game download without waiting for it to finish.
+
+        The process's output is drained by the shared output reactor, which
+        passes each line to output_callback and, once SteamCMD exits, calls
+        on_exit(success, message) with the same result download_game returns.
+        The reactor also reaps the process, including one that was killed.
+        on_spawn(process), if given, runs before the process is handed to the
+        reactor, so it always happens before on_exit.
+        Returns (process, message); process is None if it could not start.
+        """
+        if not self.is_installed():
+            logging.error("SteamCMD not installed, cannot download game")
+            if not self.install():
+                return None, "Failed to install SteamCMD"
+        
+        try:
+            args = self._download_args(appid, target_dir, validate, login_anonymous,
+                                       username, password, guard_code)
+            if args is None:
+                return None, "Invalid login information"
+            
+            cmd = [self.steamcmd_path, *args]
+            logging.info(f"Running SteamCMD command: {' '.join(cmd)}")
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        except Exception as e:
+            logging.error(f"Error downloading game {appid}: {str(e)}")
+            return None, str(e)
+        
+        def finished(returncode, output):
+            if returncode == 0:
+                logging.info(f"Successfully downloaded game {appid} to {target_dir}")
+                on_exit(True, "Download completed successfully")
+            else:
+                logging.error(f"Failed to download game {appid} (code {returncode}): {output}")
+                on_exit(False, f"Download failed: {output}")
+        
+        if on_spawn is not None:
+            on_spawn(process)
+        _reactor.watch(process, output_callback or (lambda line: None), finished)
+        return process, "Download started"
+    
+    def _download_args(self, appid, target_dir, validate, login_anonymous, username, password, guard_code):
+        """Build the SteamCMD arguments for a download, or None if the login is invalid."""
+        # Create target directory if it doesn't exist
+        os.makedirs(target_dir, exist_ok=True)
+        
+        # Login information
+        if login_anonymous:
+            login = ["+login", "anonymous"]
+        elif username and password:
+            login = ["+login", username, password, *([guard_code] if guard_code else [])]
+        else:
+            return None
+        
+        return [
+            *login,
+            "+force_install_dir", target_dir,
+            "+app_update", str(appid),
+            *(["validate"] if validate else []),
+            "+quit"
+        ]
 
 # Singleton instance for easy access
 _instance = None
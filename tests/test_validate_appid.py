@@ -0,0 +1,52 @@
+import http.server
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+class _TooManyRequests(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(429)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class ValidateAppidRateLimitTest(unittest.TestCase):
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _TooManyRequests)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        # Route the store API call to the local server through the session's
+        # own retrying adapter
+        base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        main.http_session.mount(base, main.http_session.get_adapter("https://"))
+        self.addCleanup(main.http_session.adapters.pop, base)
+        get = main.http_session.get
+        patcher = mock.patch.object(
+            main.http_session, "get",
+            lambda url, **kwargs: get(url.replace("https://store.steampowered.com", base), **kwargs)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_persistent_429_is_reported_as_failure(self):
+        with mock.patch.object(main, "get_cached_game_info", return_value=None):
+            valid, message = main.validate_appid("440")
+
+        self.assertFalse(valid)
+        self.assertEqual(message, "Steam API error: HTTP 429")
+
+
+if __name__ == "__main__":
+    unittest.main()